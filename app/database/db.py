@@ -1,9 +1,21 @@
+import logging
+
+from sqlalchemy import text
 from sqlalchemy.orm import DeclarativeBase
 from sqlalchemy.ext.asyncio import AsyncAttrs, async_sessionmaker, create_async_engine
 
 from config import DB_URL_PG
 
-engine = create_async_engine(url = DB_URL_PG, echo=True,pool_size=8)
+# The async engine already uses AsyncAdaptedQueuePool; size it for concurrent
+# bot updates and drop connections the server may have closed while idle.
+engine = create_async_engine(
+    url = DB_URL_PG,
+    echo=True,
+    pool_size=25,
+    max_overflow=25,
+    pool_pre_ping=True,
+    pool_recycle=1800
+)
 
 async_session = async_sessionmaker(engine)
 
@@ -15,10 +27,52 @@ async def async_main():
     Create all database tables defined on Base metadata asynchronously.
 
     This function opens an asynchronous connection to the database
-    and creates tables according to the ORM models defined.
+    and creates tables according to the ORM models defined. It also adds
+    the unique index on `proxy_servers.ip` to databases created before
+    the column became unique (see `_ensure_unique_server_ips`).
 
     Usage:
         await async_main()
     """
     async with engine.begin() as conn:
-        await conn.run_sync(Base.metadata.create_all)
\ No newline at end of file
+        await conn.run_sync(Base.metadata.create_all)
+        await _ensure_unique_server_ips(conn)
+
+
+# Duplicate server rows are merged into the row with the lowest id for the same IP
+_DUPLICATE_SERVERS_CTE = """
+    WITH duplicates AS (
+        SELECT id, min(id) OVER (PARTITION BY ip) AS keep_id FROM proxy_servers
+    )
+"""
+
+
+async def _ensure_unique_server_ips(conn) -> None:
+    """
+    Adds the unique index on `proxy_servers.ip` if the database does not have it yet.
+
+    Older databases could get the same server IP twice, so duplicates are merged
+    first: proxies and ports of a duplicate row are moved to the row with the
+    lowest id for that IP and the duplicate rows are deleted. Otherwise creating
+    the index would fail and stop the bot at startup.
+
+    Args:
+        conn (AsyncConnection): Connection of the schema creation transaction.
+    """
+    if await conn.scalar(text("SELECT to_regclass('proxy_servers_ip_key')")) is not None:
+        return
+
+    for table in ("proxies", "proxy_ports"):
+        await conn.execute(text(
+            _DUPLICATE_SERVERS_CTE +
+            f"UPDATE {table} t SET server_id = d.keep_id FROM duplicates d "
+            "WHERE t.server_id = d.id AND d.id <> d.keep_id"
+        ))
+    merged = (await conn.execute(text(
+        _DUPLICATE_SERVERS_CTE +
+        "DELETE FROM proxy_servers s USING duplicates d WHERE s.id = d.id AND d.id <> d.keep_id"
+    ))).rowcount
+    if merged:
+        logging.warning(f"Merged {merged} duplicate proxy_servers rows before adding the unique index on ip")
+
+    await conn.execute(text("CREATE UNIQUE INDEX proxy_servers_ip_key ON proxy_servers (ip)"))
@@ -60,12 +60,12 @@ class ProxyServer(Base):
 
     Attributes:
         id (int): Primary key.
-        ip (str): IP address of the proxy server.
+        ip (str): Unique IP address of the proxy server.
     """
     __tablename__ = 'proxy_servers'
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
-    ip: Mapped[str] = mapped_column(String(15), nullable=False)
+    ip: Mapped[str] = mapped_column(String(15), unique=True, nullable=False)
 
 
 class ProxyRental(Base):
@@ -1,4 +1,4 @@
-from sqlite3 import IntegrityError
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy import select
 from app.database.db import async_session
 from app.database.models import Protocol, Status
@@ -5,6 +5,8 @@ from sqlalchemy.exc import SQLAlchemyError
 
 from app.database.db import async_session
 from app.database.models import ProxyCatalog
+from app.database.requests.get_data import get_all_catalog, get_catalog_item_by_id, \
+    get_current_proxies_price_per_week, get_available_catalog
 
 
 async def update_proxy_price(catalog_id: int, price: int) -> bool:
@@ -16,7 +18,8 @@ async def update_proxy_price(catalog_id: int, price: int) -> bool:
         price (int): The new weekly price to be set for the proxy.
 
     Returns:
-        bool: True if the update was successful, False otherwise.
+        bool: True if the update was successful, False otherwise
+        (including when no catalog item has the given ID).
 
     Raises:
         Logs errors via the logging module instead of raising exceptions directly.
@@ -27,15 +30,28 @@ async def update_proxy_price(catalog_id: int, price: int) -> bool:
                 update(ProxyCatalog)
                 .where(ProxyCatalog.id == catalog_id)
                 .values(price_per_week=price)
+                .returning(ProxyCatalog.id)
             )
-            await session.execute(stmt)
+            result = await session.execute(stmt)
+            updated_id = result.scalar_one_or_none()
             await session.commit()
-            return True
         except SQLAlchemyError as e:
-            logging.error("proxy price update error:", e)
+            logging.error("proxy price update error: %s", e)
             await session.rollback()
             return False
 
-
-
-
+    if updated_id is None:
+        return False
+
+    get_catalog_item_by_id.invalidate(catalog_id)
+    get_current_proxies_price_per_week.invalidate(catalog_id)
+    get_available_catalog.clear()
+
+    # Write-through: patch the cached catalog instead of dropping it
+    catalog = get_all_catalog.peek()
+    if catalog is not None:
+        get_all_catalog.set(value=[
+            {**item, "price_per_week": price} if item["catalog_id"] == catalog_id else item
+            for item in catalog
+        ])
+    return True
@@ -5,22 +5,52 @@ to manage proxies, users, and related entities.
 """
 
 import logging
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
 
-from sqlalchemy import select, func
+from sqlalchemy import select, func, bindparam
 from sqlalchemy.exc import SQLAlchemyError
 
 from app.database.db import async_session
 from app.database.models import Proxy, Protocol, Operator, Status, ProxyType, ProxyCatalog, User, ProxyServer, \
     ProxyPorts, ProxyRental, ProxyTaskQueue
-from app.utils.constants import IPV4_PATTERN
+from app.utils.cache import async_ttl_cache
+from app.utils.ip import validate_ipv4
 
+# Admin list views are re-rendered on every page flip and menu open
+LIST_CACHE_TTL_SECONDS = 10
+# Operators, protocols and servers are only added by admins, and every such write clears the cache
+REFERENCE_CACHE_TTL_SECONDS = 60
+SERVER_IPS_CACHE_TTL_SECONDS = 300
 
-async def get_all_proxies_info() -> List[Dict]:
-    """Retrieves information about all proxies in the system.
+
+@async_ttl_cache(ttl=LIST_CACHE_TTL_SECONDS, maxsize=1)
+async def get_proxies_count() -> int:
+    """Counts all proxies in the system.
+
+    The result is cached for ``LIST_CACHE_TTL_SECONDS``.
 
     Returns:
-        A list of dictionaries containing proxy information with keys:
+        int: Total number of proxies.
+    """
+    async with async_session() as session:
+        return await session.scalar(select(func.count(Proxy.id)))
+
+
+@async_ttl_cache(ttl=LIST_CACHE_TTL_SECONDS, maxsize=64)
+async def get_all_proxies_info(page: int = 1, page_size: int = 6) -> Tuple[List[Dict], int]:
+    """Retrieves one page of information about the proxies in the system.
+
+    Only the requested page is fetched from the database; ``page`` is clamped
+    to the available range. The result is cached for ``LIST_CACHE_TTL_SECONDS``
+    and must not be mutated.
+
+    Args:
+        page: 1-based page number.
+        page_size: Number of proxies per page.
+
+    Returns:
+        A tuple of the proxies on the page and the total number of proxies.
+        Each proxy is a dictionary with keys:
         - id: Proxy ID
         - server_ip: Server IP address
         - internal_ip: Internal IP address
@@ -29,6 +59,13 @@ async def get_all_proxies_info() -> List[Dict]:
         - country: Country code
         - status: Proxy status
     """
+    total = await get_proxies_count()
+    if not total:
+        return [], 0
+
+    total_pages = (total + page_size - 1) // page_size
+    page = max(1, min(page, total_pages))
+
     async with async_session() as session:
         stmt = (
             select(
@@ -46,6 +83,9 @@ async def get_all_proxies_info() -> List[Dict]:
             .join(Protocol, ProxyType.protocol_id == Protocol.id)
             .join(Operator, ProxyType.operator_id == Operator.id)
             .join(Status, Proxy.status_id == Status.id)
+            .order_by(Proxy.id)
+            .limit(page_size)
+            .offset((page - 1) * page_size)
         )
 
         result = await session.execute(stmt)
@@ -59,12 +99,15 @@ async def get_all_proxies_info() -> List[Dict]:
             "operator": proxy.operator,
             "country": proxy.country,
             "status": proxy.status
-        } for proxy in proxies]
+        } for proxy in proxies], total
 
 
+@async_ttl_cache(ttl=LIST_CACHE_TTL_SECONDS, maxsize=64)
 async def get_catalog_item_by_id(proxy_catalog_id: int) -> Optional[dict]:
     """Retrieves a specific catalog item by its ID.
 
+    The result is cached for ``LIST_CACHE_TTL_SECONDS`` and must not be mutated.
+
     Args:
         proxy_catalog_id: The ID of the catalog item to retrieve.
 
@@ -98,13 +141,16 @@ async def get_catalog_item_by_id(proxy_catalog_id: int) -> Optional[dict]:
         )
 
         result = await session.execute(stmt)
-        return result.mappings().first()
+        row = result.mappings().first()
+        return dict(row) if row else None
 
 
+@async_ttl_cache(ttl=LIST_CACHE_TTL_SECONDS, maxsize=1)
 async def get_available_catalog() -> List[Dict]:
     """Retrieves all available proxy catalog items.
 
-    First refreshes the catalog availability counts.
+    First refreshes the catalog availability counts. The result is cached for
+    ``LIST_CACHE_TTL_SECONDS`` and must not be mutated.
 
     Returns:
         A list of dictionaries containing available catalog items with keys:
@@ -152,10 +198,12 @@ async def get_available_catalog() -> List[Dict]:
     return catalog_list
 
 
+@async_ttl_cache(ttl=LIST_CACHE_TTL_SECONDS, maxsize=1)
 async def get_all_catalog() -> List[Dict]:
     """Retrieves all proxy catalog items, regardless of availability.
 
-    First refreshes the catalog availability counts.
+    First refreshes the catalog availability counts. The result is cached for
+    ``LIST_CACHE_TTL_SECONDS`` and must not be mutated.
 
     Returns:
         A list of dictionaries containing all catalog items with keys:
@@ -250,9 +298,12 @@ async def get_available_proxies_count_by_type_id(proxy_type_id: int) -> int:
         return result.scalar_one()
 
 
+@async_ttl_cache(ttl=REFERENCE_CACHE_TTL_SECONDS, maxsize=1)
 async def get_all_operators() -> List[Dict]:
     """Retrieves a list of all operators.
 
+    The result is cached for ``REFERENCE_CACHE_TTL_SECONDS`` and must not be mutated.
+
     Returns:
         A list of dictionaries with operator information:
         - id: Operator ID
@@ -269,9 +320,12 @@ async def get_all_operators() -> List[Dict]:
     return operator_list
 
 
+@async_ttl_cache(ttl=REFERENCE_CACHE_TTL_SECONDS, maxsize=1)
 async def get_all_protocols() -> List[Dict]:
     """Retrieves a list of all protocols.
 
+    The result is cached for ``REFERENCE_CACHE_TTL_SECONDS`` and must not be mutated.
+
     Returns:
         A list of dictionaries with protocol information:
         - id: Protocol ID
@@ -332,9 +386,43 @@ async def get_protocol_by_id(protocol_id: int) -> Dict:
     return {}
 
 
+async def get_operator_and_protocol(operator_id: int, protocol_id: int) -> Tuple[Dict, Dict]:
+    """Retrieves an operator and a protocol by their IDs in a single query.
+
+    Args:
+        operator_id: The ID of the operator to retrieve.
+        protocol_id: The ID of the protocol to retrieve.
+
+    Returns:
+        A tuple of two dictionaries, shaped like the results of
+        `get_operator_by_id` and `get_protocol_by_id`,
+        or two empty dictionaries if either of them is not found.
+    """
+    async with async_session() as session:
+        stmt = select(
+            Operator.id.label("operator_id"),
+            Operator.name,
+            Operator.country_code,
+            Protocol.id.label("protocol_id"),
+            Protocol.value
+        ).where(Operator.id == operator_id, Protocol.id == protocol_id)
+        result = await session.execute(stmt)
+        row = result.first()
+
+    if row:
+        return (
+            {"id": row.operator_id, "name": row.name, "country_code": row.country_code},
+            {"id": row.protocol_id, "value": row.value}
+        )
+    return {}, {}
+
+
+@async_ttl_cache(ttl=SERVER_IPS_CACHE_TTL_SECONDS, maxsize=1)
 async def get_server_ips_list() -> List[str]:
     """Retrieves a list of all server IP addresses.
 
+    The result is cached for ``SERVER_IPS_CACHE_TTL_SECONDS`` and must not be mutated.
+
     Returns:
         A list of IP addresses as strings.
     """
@@ -358,7 +446,7 @@ async def get_server_id_by_ip(server_ip: str) -> Optional[int]:
     Raises:
         ValueError: If the provided IP address is invalid.
     """
-    if not IPV4_PATTERN.match(server_ip):
+    if not validate_ipv4(server_ip):
         raise ValueError("Invalid IP address format")
 
     async with async_session() as session:
@@ -381,50 +469,6 @@ async def get_server_id_by_ip(server_ip: str) -> Optional[int]:
             return None
 
 
-async def get_first_available_proxy_by_type_id(proxy_type_id: int) -> Optional[Dict]:
-    """Retrieves the first available proxy of a specific type.
-
-    Args:
-        proxy_type_id: The ID of the proxy type to retrieve.
-
-    Returns:
-        A dictionary with proxy information:
-        - id: Proxy ID
-        - internal_ip: Internal IP address
-        - server_id: Server ID
-        - status_id: Status ID
-        - proxy_type_id: Proxy type ID
-        - server_ip: Server IP address
-        - status_name: Status name
-        or None if no available proxy found.
-    """
-    async with async_session() as session:
-        stmt = (
-            select(
-                Proxy.id.label("id"),
-                Proxy.internal_ip.label("internal_ip"),
-                Proxy.server_id.label("server_id"),
-                Proxy.status_id.label("status_id"),
-                Proxy.proxy_type_id.label("proxy_type_id"),
-                ProxyServer.ip.label("server_ip"),
-                Status.value.label("status_name")
-            )
-            .select_from(Proxy)
-            .join(ProxyServer, Proxy.server_id == ProxyServer.id)
-            .join(ProxyType, Proxy.proxy_type_id == ProxyType.id)
-            .join(Status, Proxy.status_id == Status.id)
-            .where(
-                Proxy.proxy_type_id == proxy_type_id,
-                Proxy.status_id == 1
-            )
-            .order_by(Proxy.id)
-            .limit(1)
-        )
-
-        result = await session.execute(stmt)
-        return result.mappings().first()
-
-
 async def get_first_available_port_id_by_server_id(server_id: int) -> Optional[int]:
     """Retrieves the first available port ID for a given server.
 
@@ -452,9 +496,14 @@ async def get_first_available_port_id_by_server_id(server_id: int) -> Optional[i
         return port["id"] if port else None
 
 
+@async_ttl_cache(ttl=LIST_CACHE_TTL_SECONDS, maxsize=64)
 async def get_current_proxies_price_per_week(catalog_id: int) -> Optional[int]:
     """Retrieves the weekly price for a specific catalog item.
 
+    The result is cached for ``LIST_CACHE_TTL_SECONDS``, so it is meant for
+    display only; `reserve_proxy_rental` reads the price inside its own
+    transaction when charging.
+
     Args:
         catalog_id: The ID of the catalog item.
 
@@ -525,11 +574,16 @@ async def refresh_proxy_catalog() -> None:
             raise
 
 
-async def get_user_proxies_list(user_id: int) -> List[Dict]:
-    """Retrieves a list of proxies rented by a specific user.
+@async_ttl_cache(ttl=LIST_CACHE_TTL_SECONDS, maxsize=256)
+async def get_user_proxies_list_by_tg_id(tg_id: int) -> List[Dict]:
+    """Retrieves the proxies rented by a user, looked up by their Telegram ID.
+
+    The user is resolved with a join instead of a separate `get_user_id_by_tg_id`
+    query. The result is cached for ``LIST_CACHE_TTL_SECONDS`` so that paging
+    through the list does not query the database on every click.
 
     Args:
-        user_id: The ID of the user.
+        tg_id: The Telegram ID of the user.
 
     Returns:
         A list of dictionaries containing proxy rental information:
@@ -558,40 +612,32 @@ async def get_user_proxies_list(user_id: int) -> List[Dict]:
                 ProxyRental.purchase_date,
                 ProxyRental.expire_date
             )
+            .join(User, ProxyRental.user_id == User.id)
             .join(Proxy, ProxyRental.proxy_id == Proxy.id)
             .join(ProxyServer, Proxy.server_id == ProxyServer.id)
             .join(ProxyPorts, ProxyRental.port_id == ProxyPorts.id)
             .join(ProxyType, Proxy.proxy_type_id == ProxyType.id)
             .join(Protocol, ProxyType.protocol_id == Protocol.id)
             .join(Operator, ProxyType.operator_id == Operator.id)
-            .where(ProxyRental.user_id == user_id)
+            .where(User.tg_id == tg_id)
             .order_by(ProxyRental.id)
         )
 
         result = await session.execute(stmt)
-        rows = result.all()
+        return [dict(row) for row in result.mappings()]
 
-        proxies_list = []
-        for r in rows:
-            proxies_list.append({
-                "rental_id": r.rental_id,
-                "ip": r.ip,
-                "port": r.port,
-                "login": r.login,
-                "password": r.password,
-                "protocol": r.protocol,
-                "operator": r.operator,
-                "country_code": r.country_code,
-                "purchase_date": r.purchase_date,
-                "expire_date": r.expire_date
-            })
-
-    return proxies_list
+_TASK_STATUS_STMT = select(ProxyTaskQueue.status).where(ProxyTaskQueue.id == bindparam("task_id"))
 
 
+@async_ttl_cache(ttl=0.5, maxsize=256)
 async def get_task_status(task_id: int) -> Optional[str]:
     """Retrieves the status of a task by its ID.
 
+    Results are cached for half a second so that several coroutines polling the
+    same task share one query. Terminal statuses delivered by the
+    `proxy_task_status` listener are checked by `wait_for_task_completion`
+    before it falls back to this query.
+
     Args:
         task_id: The ID of the task.
 
@@ -599,8 +645,6 @@ async def get_task_status(task_id: int) -> Optional[str]:
         The task status as a string, or None if task not found.
     """
     async with async_session() as session:
-        result = await session.execute(
-            select(ProxyTaskQueue.status).where(ProxyTaskQueue.id == task_id)
-        )
+        result = await session.execute(_TASK_STATUS_STMT, {"task_id": task_id})
         status = result.scalar_one_or_none()
         return status
\ No newline at end of file
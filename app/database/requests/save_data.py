@@ -9,14 +9,17 @@ from datetime import datetime, timedelta
 from enum import Enum
 from typing import Dict, Optional, Any
 
-from sqlalchemy import select, update, insert
+from sqlalchemy import select, update, insert, exists
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from sqlalchemy.exc import SQLAlchemyError
 
 from app.database.db import async_session
 from app.database.models import Proxy, Operator, ProxyType, ProxyServer, \
-    ProxyPorts, ProxyRental, User
-from app.database.requests.get_data import get_user_balance_by_tg_id, get_user_id_by_tg_id
-from app.utils.constants import IPV4_PATTERN
+    ProxyPorts, ProxyRental, User, ProxyCatalog
+from app.database.requests.get_data import get_all_catalog, get_catalog_item_by_id, get_all_proxies_info, \
+    get_proxies_count, get_user_proxies_list_by_tg_id, get_available_catalog, get_all_operators, get_server_ips_list
+from app.database.requests.user import get_user
+from app.utils.ip import validate_ipv4
 
 
 async def save_operator_to_db(country_code: str, operator_name: str) -> bool:
@@ -34,12 +37,11 @@ async def save_operator_to_db(country_code: str, operator_name: str) -> bool:
         True
     """
     async with async_session() as session:
-        stmt = select(Operator).where(
+        stmt = select(exists().where(
             Operator.country_code == country_code.upper(),
             Operator.name== operator_name.upper(),
-        )
-        result = await session.execute(stmt)
-        existing = result.scalar_one_or_none()
+        ))
+        existing = await session.scalar(stmt)
 
         if existing:
             return False
@@ -50,6 +52,7 @@ async def save_operator_to_db(country_code: str, operator_name: str) -> bool:
         )
         session.add(new_operator)
         await session.commit()
+        get_all_operators.clear()
         return True
 
 
@@ -90,32 +93,33 @@ async def save_proxies_from_fsm(data: Dict[str, Any]) -> str:
     async with async_session() as session:
         try:
             # Check/create proxy type
-            proxy_type = await session.scalar(
-                select(ProxyType).where(
+            proxy_type_id = await session.scalar(
+                select(ProxyType.id).where(
                     ProxyType.operator_id == operator_id,
                     ProxyType.protocol_id == protocol_id
                 )
             )
 
-            if not proxy_type:
+            if proxy_type_id is None:
                 proxy_type = ProxyType(
                     operator_id=operator_id,
                     protocol_id=protocol_id
                 )
                 session.add(proxy_type)
                 await session.flush()
+                proxy_type_id = proxy_type.id
 
             # Verify server exists
-            proxy_server = await session.scalar(
-                select(ProxyServer).where(ProxyServer.ip == server_ip)
+            server_id = await session.scalar(
+                select(ProxyServer.id).where(ProxyServer.ip == server_ip)
             )
-            if not proxy_server:
+            if server_id is None:
                 return "❌ Server not found"
 
             # Process each IP address
             existing_ips = set(await session.scalars(
                 select(Proxy.internal_ip).where(
-                    Proxy.server_id == proxy_server.id
+                    Proxy.server_id == server_id
                 )
             ))
 
@@ -127,7 +131,7 @@ async def save_proxies_from_fsm(data: Dict[str, Any]) -> str:
 
             for internal_ip in internal_ips:
                 # Validate IP format
-                if not IPV4_PATTERN.match(internal_ip):
+                if not validate_ipv4(internal_ip):
                     results.append(f"⛔ {internal_ip} - invalid IP address")
                     invalid_count += 1
                     continue
@@ -140,9 +144,9 @@ async def save_proxies_from_fsm(data: Dict[str, Any]) -> str:
 
                 # Add new proxy
                 new_proxy = Proxy(
-                    server_id=proxy_server.id,
+                    server_id=server_id,
                     internal_ip=internal_ip,
-                    proxy_type_id=proxy_type.id,
+                    proxy_type_id=proxy_type_id,
                     status_id=1,  # "Active" status
                 )
                 new_proxies.append(new_proxy)
@@ -153,6 +157,11 @@ async def save_proxies_from_fsm(data: Dict[str, Any]) -> str:
             if new_proxies:
                 session.add_all(new_proxies)
                 await session.commit()
+                get_proxies_count.clear()
+                get_all_proxies_info.clear()
+                get_all_catalog.clear()
+                get_catalog_item_by_id.clear()
+                get_available_catalog.clear()
 
             # Generate report
             report = (
@@ -181,22 +190,24 @@ async def save_server_ip(server_ip: str) -> bool:
     Args:
         server_ip: The IP address of the server to add.
 
+    Uses a single ``INSERT ... ON CONFLICT DO NOTHING RETURNING`` statement,
+    so the existence check and the insert are atomic.
+
     Returns:
         bool: True if the server was added, False if it already exists.
     """
+    stmt = (
+        pg_insert(ProxyServer)
+        .values(ip=server_ip)
+        .on_conflict_do_nothing(index_elements=[ProxyServer.ip])
+        .returning(ProxyServer.id)
+    )
     async with async_session() as session:
-        stmt = select(ProxyServer).where(
-            ProxyServer.ip == server_ip
-        )
-        result = await session.execute(stmt)
-        existing = result.scalar_one_or_none()
-        if existing:
-            return False
-
-        new_server = ProxyServer(ip=server_ip)
-        session.add(new_server)
+        server_id = await session.scalar(stmt)
         await session.commit()
-        return True
+        if server_id is not None:
+            get_server_ips_list.clear()
+        return server_id is not None
 
 
 class ProxyStatus(Enum):
@@ -252,6 +263,10 @@ async def update_proxy_status(proxy_id: int, status: str = "Available") -> Optio
 
             result = await session.execute(stmt)
             await session.commit()
+            get_all_proxies_info.clear()
+            get_all_catalog.clear()
+            get_catalog_item_by_id.clear()
+            get_available_catalog.clear()
 
             return result.rowcount > 0
 
@@ -292,12 +307,14 @@ async def update_port_status(port_id: int, status: str = "Available") -> Optiona
             return False
 
 
-async def save_port_list(port_list: list[str], server_id: int) -> Optional[str]:
+async def save_port_list(port_list: list[str], server_ip: str) -> Optional[str]:
     """Saves a list of ports for a specific server.
 
+    The server ID and its existing ports are fetched with one query.
+
     Args:
         port_list: List of port numbers as strings.
-        server_id: The ID of the server these ports belong to.
+        server_ip: The IP address of the server these ports belong to.
 
     Returns:
         str: A detailed report of the operation including:
@@ -305,21 +322,28 @@ async def save_port_list(port_list: list[str], server_id: int) -> Optional[str]:
              - Duplicate ports
              - Invalid ports
              - Summary statistics
-        None: If there was a critical error.
+        None: If no server with the given IP address exists.
 
     Raises:
         SQLAlchemyError: If there's a database error.
     """
     async with async_session() as session:
         try:
-            # Get existing ports for this server
-            existing_ports_result = await session.execute(
-                select(ProxyPorts.port)
-                .where(ProxyPorts.server_id == server_id)
+            # Get the server and its existing ports
+            server_ports_result = await session.execute(
+                select(ProxyServer.id, ProxyPorts.port)
+                .outerjoin(ProxyPorts, ProxyPorts.server_id == ProxyServer.id)
+                .where(ProxyServer.ip == server_ip)
             )
-            existing_ports = {port[0] for port in existing_ports_result}
+            server_ports = server_ports_result.all()
+            if not server_ports:
+                return None
+
+            server_id = server_ports[0].id
+            existing_ports = {row.port for row in server_ports if row.port is not None}
 
             results = []
+            new_ports = []
             added_count = 0
             duplicate_count = 0
             invalid_count = 0
@@ -338,14 +362,7 @@ async def save_port_list(port_list: list[str], server_id: int) -> Optional[str]:
                         duplicate_count += 1
                         continue
 
-                    # Add new port
-                    await session.execute(
-                        insert(ProxyPorts)
-                        .values(
-                            server_id=server_id,
-                            port=port,
-                            status_id=1)
-                    )
+                    new_ports.append({"server_id": server_id, "port": port, "status_id": 1})
                     results.append(f"✅ {port} - successfully added")
                     added_count += 1
                     existing_ports.add(port)
@@ -353,7 +370,10 @@ async def save_port_list(port_list: list[str], server_id: int) -> Optional[str]:
                     results.append(f"⛔ {port_str} - non-numeric value")
                     invalid_count += 1
 
-            await session.commit()
+            # Insert all new ports in a single batch
+            if new_ports:
+                await session.execute(insert(ProxyPorts), new_ports)
+                await session.commit()
 
             summary = (
                     "\n".join(results) +
@@ -375,91 +395,132 @@ async def save_port_list(port_list: list[str], server_id: int) -> Optional[str]:
             return f"❌ Unknown error: {e}"
 
 
-async def create_proxy_rental(
+class RentalReservationStatus(Enum):
+    """Outcome of :func:`reserve_proxy_rental`.
+
+    Attributes:
+        OK: The proxy and port were reserved and the user was charged
+        NO_PRICE: The catalog item has no price
+        NO_PROXY: No free proxy of the requested type
+        NO_PORT: No free port on the proxy's server
+        NO_USER: The user does not exist
+        INSUFFICIENT_BALANCE: The user's balance does not cover the rental
+    """
+    OK = "ok"
+    NO_PRICE = "no_price"
+    NO_PROXY = "no_proxy"
+    NO_PORT = "no_port"
+    NO_USER = "no_user"
+    INSUFFICIENT_BALANCE = "insufficient_balance"
+
+
+async def reserve_proxy_rental(
         tg_id: int,
-        proxy_id: int,
+        catalog_id: int,
+        proxy_type_id: int,
         term: int,
-        port_id: int,
         login: str,
         password: str,
-) -> ProxyRental:
-    """Creates a new proxy rental record.
+) -> Dict[str, Any]:
+    """Atomically reserves a proxy and port, charges the user and records the rental.
+
+    Everything runs in one transaction. The proxy and port rows are locked with
+    ``FOR UPDATE SKIP LOCKED`` so concurrent purchases never pick the same ones,
+    and the balance is charged with a conditional ``UPDATE`` so it cannot go
+    negative. If any step fails nothing is written.
 
     Args:
         tg_id: Telegram ID of the user renting the proxy.
-        proxy_id: ID of the proxy being rented.
+        catalog_id: ID of the catalog item being purchased (for the current price).
+        proxy_type_id: ID of the proxy type to rent.
         term: Rental duration in weeks.
-        port_id: ID of the port being assigned.
         login: Authentication login for the proxy.
         password: Authentication password for the proxy.
 
     Returns:
-        ProxyRental: The newly created rental record.
-
-    Note:
-        Automatically calculates expiration date based on current date + term.
+        Dict[str, Any]: A dictionary with keys:
+            - status: A :class:`RentalReservationStatus`
+            - total_price: Price of the rental, or None if the price is unknown
+            - balance: The user's balance after the charge, or the current balance
+              if it was insufficient
+            - proxy_id, port_id, rental_id: Set only when status is OK
     """
-    async with async_session() as session:
-        purchase_date = datetime.now()
-        expire_date = purchase_date + timedelta(weeks=term)
-        user_id = await get_user_id_by_tg_id(tg_id)
-
-        new_rental = ProxyRental(
-            user_id=user_id,
-            proxy_id=proxy_id,
-            purchase_date=purchase_date,
-            expire_date=expire_date,
-            port_id=port_id,
-            login=login,
-            password=password
-        )
-        session.add(new_rental)
-        await session.commit()
-        await session.refresh(new_rental)
-
-        return new_rental
-
+    outcome: Dict[str, Any] = {"status": None, "total_price": None, "balance": None,
+                               "proxy_id": None, "port_id": None, "rental_id": None}
 
-async def decrease_user_balance(tg_id: int, amount: float) -> bool:
-    """Decreases a user's balance by the specified amount.
-
-    Args:
-        tg_id: Telegram ID of the user.
-        amount: Amount to deduct from the balance.
+    async with async_session() as session, session.begin():
+        price_per_week = await session.scalar(
+            select(ProxyCatalog.price_per_week).where(ProxyCatalog.id == catalog_id)
+        )
+        if not price_per_week:
+            outcome["status"] = RentalReservationStatus.NO_PRICE
+            return outcome
+        total_price = price_per_week * term
+        outcome["total_price"] = total_price
+
+        proxy = (await session.execute(
+            select(Proxy.id, Proxy.server_id)
+            .where(Proxy.proxy_type_id == proxy_type_id, Proxy.status_id == ProxyStatus.ACTIVE.value[1])
+            .order_by(Proxy.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )).first()
+        if proxy is None:
+            outcome["status"] = RentalReservationStatus.NO_PROXY
+            return outcome
+
+        port_id = await session.scalar(
+            select(ProxyPorts.id)
+            .where(ProxyPorts.server_id == proxy.server_id, ProxyPorts.status_id == ProxyStatus.ACTIVE.value[1])
+            .order_by(ProxyPorts.id)
+            .limit(1)
+            .with_for_update(skip_locked=True)
+        )
+        if port_id is None:
+            outcome["status"] = RentalReservationStatus.NO_PORT
+            return outcome
+
+        charged = (await session.execute(
+            update(User)
+            .where(User.tg_id == tg_id, User.balance >= total_price)
+            .values(balance=User.balance - total_price)
+            .returning(User.id, User.balance)
+        )).first()
+        if charged is None:
+            balance = await session.scalar(select(User.balance).where(User.tg_id == tg_id))
+            outcome["balance"] = balance
+            outcome["status"] = (RentalReservationStatus.NO_USER if balance is None
+                                 else RentalReservationStatus.INSUFFICIENT_BALANCE)
+            return outcome
 
-    Returns:
-        bool: True if the operation was successful, False if:
-              - User not found
-              - Insufficient balance
-              - Database error occurred
-    """
-    async with async_session() as session:
-        try:
-            # Check current balance
-            current_balance = await get_user_balance_by_tg_id(tg_id)
-
-            # Return False if user not found or balance is None
-            if current_balance is None:
-                return False
-
-            # Check sufficient funds
-            if current_balance < amount:
-                return False
-
-            # Update balance
-            async with session.begin():
-                update_stmt = (
-                    update(User)
-                    .where(User.tg_id == tg_id)
-                    .values(balance=User.balance - amount)
-                )
-                await session.execute(update_stmt)
+        purchase_date = datetime.now()
+        rental_id = await session.scalar(
+            insert(ProxyRental)
+            .values(
+                user_id=charged.id,
+                proxy_id=proxy.id,
+                port_id=port_id,
+                purchase_date=purchase_date,
+                expire_date=purchase_date + timedelta(weeks=term),
+                login=login,
+                password=password)
+            .returning(ProxyRental.id)
+        )
+        rented_status_id = ProxyStatus.RENTED.value[1]
+        await session.execute(
+            update(Proxy).where(Proxy.id == proxy.id).values(status_id=rented_status_id)
+        )
+        await session.execute(
+            update(ProxyPorts).where(ProxyPorts.id == port_id).values(status_id=rented_status_id)
+        )
 
-            return True
+    get_user.invalidate(tg_id)
+    get_user_proxies_list_by_tg_id.invalidate(tg_id)
+    get_all_proxies_info.clear()
+    get_all_catalog.clear()
+    get_catalog_item_by_id.clear()
+    get_available_catalog.clear()
 
-        except SQLAlchemyError as e:
-            logging.error(f"Database error: {e}")
-            return False
-        except Exception as e:
-            logging.error(f"Unexpected error: {e}")
-            return False
\ No newline at end of file
+    outcome.update(status=RentalReservationStatus.OK, balance=charged.balance,
+                   proxy_id=proxy.id, port_id=port_id, rental_id=rental_id)
+    return outcome
@@ -0,0 +1,120 @@
+"""Listener for proxy task status notifications.
+
+The `trg_proxy_task_status_notify` trigger publishes a JSON payload on the
+`proxy_task_status` channel whenever a task reaches a terminal status. This
+module keeps those statuses in a bounded in-memory map so task status checks
+can be answered without a database round-trip, and wakes up coroutines that
+are waiting for a particular task to finish.
+"""
+
+import asyncio
+import json
+import logging
+from collections import OrderedDict
+from typing import Optional
+
+from app.database.db import engine
+
+TASK_STATUS_CHANNEL = "proxy_task_status"
+TERMINAL_STATUSES = frozenset({"done", "error"})
+
+_MAX_TERMINAL_STATUSES = 10_000
+_RECONNECT_DELAY_SECONDS = 5
+
+_terminal_statuses: OrderedDict[int, str] = OrderedDict()
+_task_waiters: dict[int, asyncio.Event] = {}
+
+
+def get_terminal_status(task_id: int) -> Optional[str]:
+    """Returns the terminal status received for a task, or None if not known yet.
+
+    Args:
+        task_id: The ID of the task.
+    """
+    return _terminal_statuses.get(task_id)
+
+
+def discard_terminal_status(task_id: int) -> None:
+    """Forgets the terminal status of a task once it has been consumed.
+
+    Args:
+        task_id: The ID of the task.
+    """
+    _terminal_statuses.pop(task_id, None)
+
+
+def register_task_waiter(task_id: int) -> asyncio.Event:
+    """Returns an event that is set once a terminal status for the task is received.
+
+    The event is already set if the status arrived before registration.
+    Call :func:`discard_task_waiter` when done waiting.
+
+    Args:
+        task_id: The ID of the task.
+    """
+    event = _task_waiters.setdefault(task_id, asyncio.Event())
+    if task_id in _terminal_statuses:
+        event.set()
+    return event
+
+
+def discard_task_waiter(task_id: int) -> None:
+    """Stops tracking the waiter registered for a task.
+
+    Args:
+        task_id: The ID of the task.
+    """
+    _task_waiters.pop(task_id, None)
+
+
+def _on_task_status_event(connection, pid, channel, payload) -> None:
+    try:
+        data = json.loads(payload)
+        task_id = int(data["task_id"])
+        status = data["status"]
+    except (ValueError, KeyError, TypeError) as e:
+        logging.warning(f"Malformed {channel} notification {payload!r}: {e}")
+        return
+
+    if status not in TERMINAL_STATUSES:
+        return
+
+    _terminal_statuses[task_id] = status
+    _terminal_statuses.move_to_end(task_id)
+    while len(_terminal_statuses) > _MAX_TERMINAL_STATUSES:
+        _terminal_statuses.popitem(last=False)
+
+    waiter = _task_waiters.get(task_id)
+    if waiter is not None:
+        waiter.set()
+
+
+async def listen_task_status_events() -> None:
+    """
+    Listens for task status notifications for the lifetime of the bot.
+
+    Holds one pooled connection with a LISTEN on the `proxy_task_status` channel
+    and reconnects after a delay if the connection is lost.
+    """
+    while True:
+        try:
+            async with engine.connect() as conn:
+                raw_connection = await conn.get_raw_connection()
+                driver_connection = raw_connection.driver_connection
+                terminated = asyncio.Event()
+
+                driver_connection.add_termination_listener(lambda _, event=terminated: event.set())
+                await driver_connection.add_listener(TASK_STATUS_CHANNEL, _on_task_status_event)
+                try:
+                    await terminated.wait()
+                finally:
+                    if not driver_connection.is_closed():
+                        await driver_connection.remove_listener(TASK_STATUS_CHANNEL, _on_task_status_event)
+
+            logging.warning(f"Connection listening on {TASK_STATUS_CHANNEL} was closed, reconnecting")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logging.error(f"Error while listening on {TASK_STATUS_CHANNEL}: {e}")
+
+        await asyncio.sleep(_RECONNECT_DELAY_SECONDS)
@@ -1,7 +1,8 @@
 import asyncio
+import logging
 from typing import List, Tuple
 
-from sqlalchemy import select, func, delete
+from sqlalchemy import select, delete, bindparam, func
 
 from app.database.db import async_session
 from app.database.models import (
@@ -9,6 +10,44 @@ from app.database.models import (
     Operator, ProxyType, ProxyTaskQueue, TaskStatusEnum
 )
 from app.database.requests.get_data import get_task_status
+from app.database.requests.task_events import discard_terminal_status, get_terminal_status, \
+    register_task_waiter, discard_task_waiter
+from app.utils.cache import async_ttl_cache
+
+# Task lists are browsed page by page; repeated page reads are served from this cache
+TASK_LIST_CACHE_TTL_SECONDS = 30
+
+# Hot statements are built once at import; per-call values are bound as parameters.
+_TASK_DATA_STMT = (
+    select(
+        ProxyServer.ip.label("server_ip"),
+        Proxy.internal_ip,
+        ProxyPorts.port,
+        Protocol.value.label("protocol"),
+        Operator.name.label("operator")
+    ).join(Proxy, ProxyServer.id == Proxy.server_id)
+     .join(ProxyType, ProxyType.id == Proxy.proxy_type_id)
+     .join(Protocol, Protocol.id == ProxyType.protocol_id)
+     .join(Operator, Operator.id == ProxyType.operator_id)
+     .join(ProxyPorts, ProxyPorts.id == bindparam("port_id"))
+     .where(Proxy.id == bindparam("proxy_id"))
+)
+
+_TASKS_PAGE_BY_STATUS_STMT = (
+    select(ProxyTaskQueue)
+    .where(ProxyTaskQueue.status == bindparam("status"))
+    .order_by(ProxyTaskQueue.created_at, ProxyTaskQueue.id)
+    .limit(bindparam("limit"))
+    .offset(bindparam("offset"))
+)
+
+_COUNT_TASKS_BY_STATUS_STMT = select(func.count(ProxyTaskQueue.id)).where(
+    ProxyTaskQueue.status == bindparam("status")
+)
+
+_DELETE_TASKS_BY_STATUS_STMT = delete(ProxyTaskQueue).where(
+    ProxyTaskQueue.status == bindparam("status")
+).returning(ProxyTaskQueue.id).execution_options(synchronize_session=False)
 
 
 async def add_task_to_queue(
@@ -36,18 +75,8 @@ async def add_task_to_queue(
     """
     async with async_session() as session:
         result = await session.execute(
-            select(
-                ProxyServer.ip.label("server_ip"),
-                Proxy.internal_ip,
-                ProxyPorts.port,
-                Protocol.value.label("protocol"),
-                Operator.name.label("operator")
-            ).join(Proxy, ProxyServer.id == Proxy.server_id)
-             .join(ProxyType, ProxyType.id == Proxy.proxy_type_id)
-             .join(Protocol, Protocol.id == ProxyType.protocol_id)
-             .join(Operator, Operator.id == ProxyType.operator_id)
-             .join(ProxyPorts, ProxyPorts.id == port_id)
-             .where(Proxy.id == proxy_id)
+            _TASK_DATA_STMT,
+            {"proxy_id": proxy_id, "port_id": port_id}
         )
         data = result.first()
         if data is None:
@@ -67,54 +96,104 @@ async def add_task_to_queue(
             }
         )
         session.add(task)
+        # The primary key comes back via INSERT ... RETURNING on flush
+        await session.flush()
+        task_id = task.id
         await session.commit()
-        await session.refresh(task)
-        return task.id
+        return task_id
 
 
 async def wait_for_task_completion(task_id: int, timeout: int = 60, interval: int = 2) -> bool:
     """
     Wait until a task is completed or failed, or the timeout is reached.
 
+    The wait is woken up by the task status notification as soon as the task
+    reaches a terminal status. The database is still checked every ``interval``
+    seconds in case a notification is missed (e.g. while the listener reconnects).
+    The timeout is measured against the event loop's monotonic clock.
+
     Args:
         task_id (int): ID of the task to monitor.
         timeout (int, optional): Maximum time to wait in seconds. Defaults to 60.
-        interval (int, optional): Interval between status checks in seconds. Defaults to 2.
+        interval (int, optional): Interval between fallback status checks in seconds. Defaults to 2.
 
     Returns:
         bool: True if the task completed successfully, False if failed or timeout.
     """
-    waited = 0
-    while waited < timeout:
-        status = await get_task_status(task_id)
-        if status == "done":
-            return True
-        elif status == "error":
-            return False
-        await asyncio.sleep(interval)
-        waited += interval
-    return False
-
-
-async def get_tasks_by_status(status: TaskStatusEnum) -> List[ProxyTaskQueue]:
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + timeout
+    finished = register_task_waiter(task_id)
+    try:
+        while True:
+            status = get_terminal_status(task_id) or await get_task_status(task_id)
+            if status in ("done", "error"):
+                get_task_status.invalidate(task_id)
+                discard_terminal_status(task_id)
+                return status == "done"
+
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                return False
+            try:
+                await asyncio.wait_for(finished.wait(), timeout=min(interval, remaining))
+            except asyncio.TimeoutError:
+                pass
+    finally:
+        discard_task_waiter(task_id)
+
+
+@async_ttl_cache(ttl=TASK_LIST_CACHE_TTL_SECONDS, maxsize=len(TaskStatusEnum))
+async def count_tasks_by_status(status: TaskStatusEnum) -> int:
     """
-    Retrieve all tasks from the queue that have a specific status.
+    Count the tasks in the queue that have a specific status.
+
+    The result is cached per status for ``TASK_LIST_CACHE_TTL_SECONDS``.
 
     Args:
         status (TaskStatusEnum): The task status to filter by.
 
     Returns:
-        List[ProxyTaskQueue]: List of tasks matching the given status.
+        int: Number of tasks with the given status.
     """
     async with async_session() as session:
-        stmt = select(ProxyTaskQueue).where(
-            ProxyTaskQueue.status == status
-        ).order_by(ProxyTaskQueue.created_at)
+        return await session.scalar(_COUNT_TASKS_BY_STATUS_STMT, {"status": status})
+
+
+@async_ttl_cache(ttl=TASK_LIST_CACHE_TTL_SECONDS, maxsize=64)
+async def get_tasks_by_status_page(status: TaskStatusEnum, offset: int, limit: int) -> List[ProxyTaskQueue]:
+    """
+    Retrieve one page of tasks that have a specific status, oldest first.
+
+    The result is cached per (status, offset, limit) for ``TASK_LIST_CACHE_TTL_SECONDS``.
+
+    Args:
+        status (TaskStatusEnum): The task status to filter by.
+        offset (int): Number of tasks to skip.
+        limit (int): Maximum number of tasks to return.
 
-        result = await session.execute(stmt)
+    Returns:
+        List[ProxyTaskQueue]: Tasks on the requested page.
+    """
+    async with async_session() as session:
+        result = await session.execute(
+            _TASKS_PAGE_BY_STATUS_STMT,
+            {"status": status, "offset": offset, "limit": limit}
+        )
         return result.scalars().all()
 
 
+def invalidate_task_list_cache(status: TaskStatusEnum) -> None:
+    """
+    Drop the cached count and pages for task lists so the next read hits the database.
+
+    Args:
+        status (TaskStatusEnum): The status whose count should be dropped.
+    """
+    count_tasks_by_status.invalidate(status)
+    # Pages are keyed by offset as well; the cache is tiny, so drop it whole
+    get_tasks_by_status_page.clear()
+
+
 async def delete_tasks_by_status(status: TaskStatusEnum) -> Tuple[int, int]:
     """
     Delete all tasks from the queue that have a specific status.
@@ -125,27 +204,21 @@ async def delete_tasks_by_status(status: TaskStatusEnum) -> Tuple[int, int]:
     Returns:
         Tuple[int, int]: A tuple where the first element is the number of matching tasks,
                          and the second element is the number of rows actually deleted.
+                         Both are taken from a single DELETE ... RETURNING, so they are always equal.
 
     Raises:
         Exception: If an error occurs during deletion, the exception is logged and re-raised.
     """
     async with async_session() as session:
         try:
-            count_stmt = select(func.count()).where(ProxyTaskQueue.status == status)
-            total_count = (await session.execute(count_stmt)).scalar()
-
-            if total_count == 0:
-                return (0, 0)
-
-            delete_stmt = delete(ProxyTaskQueue).where(
-                ProxyTaskQueue.status == status
-            )
-            result = await session.execute(delete_stmt)
+            result = await session.execute(_DELETE_TASKS_BY_STATUS_STMT, {"status": status})
+            deleted_count = len(result.all())
             await session.commit()
+            invalidate_task_list_cache(status)
 
-            return (total_count, result.rowcount)
+            return (deleted_count, deleted_count)
 
         except Exception as e:
             await session.rollback()
-            print(f"Error while deleting tasks: {e}")
+            logging.error(f"Error while deleting tasks: {e}")
             raise
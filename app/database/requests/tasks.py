@@ -1,104 +1,162 @@
 import asyncio
 import logging
+from typing import Tuple
 
-from sqlalchemy import select, func
+from sqlalchemy import select, func, text
+from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.database.db import async_session
-from app.database.models import (
-    ProxyRental, ProxyServer, Proxy, ProxyPorts,
-    Protocol, Operator, ProxyType
-)
-from app.database.requests.save_data import update_proxy_status, update_port_status
+from app.database.models import ProxyRental
+from app.database.requests.get_data import get_user_proxies_list_by_tg_id, get_all_proxies_info, get_all_catalog, \
+    get_catalog_item_by_id, get_available_catalog
+from app.database.requests.save_data import ProxyStatus
 from app.database.requests.task_handler import add_task_to_queue, wait_for_task_completion
 from config import CHECK_INTERVAL_SECONDS
 
+CLEANUP_BATCH_SIZE = 10
+REMOVE_TASK_TIMEOUT_SECONDS = 5
+
+_RELEASE_RENTAL_STMT = text("""
+    WITH released_proxy AS (
+        UPDATE proxies SET status_id = :status_id WHERE id = :proxy_id RETURNING 1
+    ), released_port AS (
+        UPDATE proxy_ports SET status_id = :status_id WHERE id = :port_id RETURNING 1
+    )
+    DELETE FROM proxy_rentals WHERE id = :rental_id
+""")
+
 
 async def clean_expired_proxy_rentals():
     """
     Continuously checks for and processes expired proxy rentals.
 
     This function runs in an infinite loop. It:
-        - Selects all proxy rentals with an `expire_date` less than or equal to the current time.
-        - For each expired rental:
-            - Gathers associated proxy, port, protocol, and operator data.
-            - Adds a task to the queue to remove the proxy configuration from the server.
-            - Waits briefly for the task to complete.
-            - Marks the proxy and port as "Available".
-            - Deletes the expired rental from the database.
-        - If errors occur, logs the issue and still attempts to clean up and remove the expired rental.
-
-    This function sleeps between cycles based on the configured interval.
-
-    Raises:
-        Exception: Any unhandled exception during database operations or task management
-                  will be logged and retried.
+        - Locks up to `CLEANUP_BATCH_SIZE` proxy rentals with an `expire_date` less than or equal
+          to the current time, skipping rows already locked by another running instance.
+        - Adds a task to the queue to remove each rental's proxy configuration from the server.
+        - Waits briefly for all of these tasks at once.
+        - For each expired rental, marks the proxy and port as "Available" and deletes the rental.
+        - If a task cannot be queued or does not finish (including rentals whose proxy data
+          is missing), logs the issue and still releases the expired rental.
+
+    Each cycle runs in a single session and transaction; every rental is released
+    inside its own savepoint, so a failure only rolls back that rental.
+
+    This function sleeps between cycles based on the configured interval, unless the
+    last cycle filled a whole batch and released at least one rental.
+
+    An error that escapes a cycle (e.g. a lost connection while selecting the batch or
+    committing) is logged, and the loop goes on with the next cycle after the usual sleep.
     """
     while True:
-        async with async_session() as session:
+        expired_count = released_count = 0
+        try:
+            expired_count, released_count = await _clean_expired_batch()
+        except Exception:
+            logging.exception("Expired rental cleanup cycle failed")
+
+        if released_count:
+            # Rentals are cached per Telegram ID; expiry is rare enough to just drop them all
+            get_user_proxies_list_by_tg_id.clear()
+            # Released proxies are available again, as after update_proxy_status
+            get_all_proxies_info.clear()
+            get_all_catalog.clear()
+            get_catalog_item_by_id.clear()
+            get_available_catalog.clear()
+
+        # A full, productive batch means more rentals may be waiting, so start the next cycle right away
+        if expired_count < CLEANUP_BATCH_SIZE or not released_count:
+            await asyncio.sleep(CHECK_INTERVAL_SECONDS)
+
+
+async def _clean_expired_batch() -> Tuple[int, int]:
+    """
+    Runs one cleanup cycle over a batch of expired rentals.
+
+    The remove_proxy tasks for the whole batch are queued first and then awaited
+    together, so the cycle's transaction waits at most ``REMOVE_TASK_TIMEOUT_SECONDS``
+    however many rentals it claimed.
+
+    Returns:
+        Tuple[int, int]: Number of expired rentals claimed and number of rentals released.
+    """
+    async with async_session() as session:
+        async with session.begin():
             expired_rentals = (await session.execute(
-                select(ProxyRental).where(ProxyRental.expire_date <= func.now()))
-            ).scalars().all()
-
-        for rental in expired_rentals:
-            task_id = None
-            try:
-                async with async_session() as session:
-                    async with session.begin():
-                        result = await session.execute(
-                            select(
-                                ProxyServer.ip.label("server_ip"),
-                                Proxy.internal_ip,
-                                ProxyPorts.port,
-                                Protocol.value.label("protocol"),
-                                Operator.name.label("operator")
-                            ).join(Proxy, ProxyServer.id == Proxy.server_id)
-                            .join(ProxyType, ProxyType.id == Proxy.proxy_type_id)
-                            .join(Protocol, Protocol.id == ProxyType.protocol_id)
-                            .join(Operator, Operator.id == ProxyType.operator_id)
-                            .join(ProxyPorts, ProxyPorts.id == rental.port_id)
-                            .where(Proxy.id == rental.proxy_id)
-                        )
-                        data = result.first()
-                        if not data:
-                            logging.warning(f"⚠️ No data found for rental_id={rental.id}. Skipping.")
-                            continue
-
-                        task_id = await add_task_to_queue(
-                            proxy_id=rental.proxy_id,
-                            port_id=rental.port_id,
-                            login=rental.login,
-                            password=rental.password,
-                            task_type="remove_proxy"
-                        )
-
-                # Wait for task completion (outside transaction)
-                success = await wait_for_task_completion(task_id, timeout=5)
-                if not success:
-                    logging.warning(f"⏳ Timeout while waiting for remove_proxy task for rental_id={rental.id}")
-
-                # Update statuses and delete rental
-                async with async_session() as session:
-                    async with session.begin():
-                        await update_proxy_status(rental.proxy_id, status="Available")
-                        await update_port_status(rental.port_id, status="Available")
-                        await session.delete(rental)
-
-                logging.info(f"✅ Rental rental_id={rental.id} successfully cleaned up")
-
-            except Exception as e:
-                rental_id = getattr(rental, "id", "unknown")
-
-                # Attempt to delete the rental even if task failed
+                select(ProxyRental)
+                .where(ProxyRental.expire_date <= func.now())
+                .order_by(ProxyRental.expire_date)
+                .limit(CLEANUP_BATCH_SIZE)
+                .with_for_update(skip_locked=True)
+            )).scalars().all()
+
+            # Only plain column values are used from here on, not the ORM objects
+            claimed = [
+                (rental.id, rental.proxy_id, rental.port_id, rental.login, rental.password)
+                for rental in expired_rentals
+            ]
+
+            task_ids = {}
+            for rental_id, proxy_id, port_id, login, password in claimed:
                 try:
-                    async with async_session() as session:
-                        async with session.begin():
-                            await update_proxy_status(rental.proxy_id, status="Available")
-                            await update_port_status(rental.port_id, status="Available")
-                            await session.delete(rental)
-                    logging.warning(f"⚠️ Rental rental_id={rental_id} forcibly removed after error")
-                except Exception as ex:
-                    logging.error(f"❌ Secondary error while removing rental_id={rental_id}: {ex}")
-
-                logging.error(f"❌ Error while cleaning up rental_id={rental_id}: {e}")
-
-        await asyncio.sleep(CHECK_INTERVAL_SECONDS)
+                    task_ids[rental_id] = await add_task_to_queue(
+                        proxy_id=proxy_id,
+                        port_id=port_id,
+                        login=login,
+                        password=password,
+                        task_type="remove_proxy"
+                    )
+                except ValueError:
+                    # The proxy or port is gone, so there is nothing to remove from the server;
+                    # the rental is still released below instead of blocking the batch forever
+                    logging.warning(f"⚠️ No data found for rental_id={rental_id}. Releasing without server cleanup.")
+                except Exception as e:
+                    logging.error(f"❌ Error while queueing remove_proxy for rental_id={rental_id}: {e}")
+
+            results = await asyncio.gather(
+                *(wait_for_task_completion(task_id, timeout=REMOVE_TASK_TIMEOUT_SECONDS)
+                  for task_id in task_ids.values()),
+                return_exceptions=True
+            )
+            for rental_id, success in zip(task_ids, results, strict=True):
+                if success is not True:
+                    logging.warning(f"⏳ remove_proxy task for rental_id={rental_id} did not finish in time or failed")
+
+            released_count = 0
+            for rental_id, proxy_id, port_id, _, _ in claimed:
+                # The statuses and the rental are written together, so if this cycle's transaction
+                # is broken none of them is, and the rental stays expired for the next cycle
+                try:
+                    async with session.begin_nested():
+                        await _release_rental(session, rental_id, proxy_id, port_id)
+                except Exception as e:
+                    logging.error(f"❌ Error while releasing rental_id={rental_id}: {e}")
+                    continue
+
+                released_count += 1
+                logging.info(f"✅ Rental rental_id={rental_id} successfully cleaned up")
+
+    return len(claimed), released_count
+
+
+async def _release_rental(session: AsyncSession, rental_id: int, proxy_id: int, port_id: int) -> None:
+    """
+    Marks the rented proxy and port as available and deletes the rental.
+
+    All three writes are sent as one statement with data-modifying CTEs.
+
+    Args:
+        session (AsyncSession): Session of the current cleanup cycle.
+        rental_id (int): ID of the rental to delete.
+        proxy_id (int): ID of the rented proxy.
+        port_id (int): ID of the rented port.
+    """
+    await session.execute(
+        _RELEASE_RENTAL_STMT,
+        {
+            "status_id": ProxyStatus.get_status_id("Available"),
+            "proxy_id": proxy_id,
+            "port_id": port_id,
+            "rental_id": rental_id,
+        }
+    )
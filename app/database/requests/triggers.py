@@ -104,3 +104,56 @@ async def create_proxy_task_queue_update_trigger():
         except IntegrityError:
             await session.rollback()
             raise
+
+async def create_proxy_task_status_notify_trigger():
+    """
+    Creates a PostgreSQL trigger and function to notify listeners when a task in
+    `proxy_task_queue` reaches a terminal status.
+
+    This function:
+        - Checks for the `notify_proxy_task_status` function and creates it if missing.
+        - Adds the `trg_proxy_task_status_notify` trigger on `proxy_task_queue` if missing.
+        - The trigger fires AFTER UPDATE and calls `pg_notify` on the 'proxy_task_status'
+          channel with the task ID and status, only when `status` is changed to 'done' or 'error'.
+
+    Raises:
+        IntegrityError: If a commit fails due to a constraint or integrity issue.
+    """
+    async with async_session() as session:
+        result_func = await session.execute(
+            text("SELECT 1 FROM pg_proc WHERE proname = 'notify_proxy_task_status'")
+        )
+        if result_func.scalar() is None:
+            await session.execute(text("""
+                CREATE FUNCTION notify_proxy_task_status() RETURNS trigger AS $$
+                BEGIN
+                    IF NEW.status IS DISTINCT FROM OLD.status AND NEW.status IN ('done', 'error') THEN
+                        PERFORM pg_notify(
+                            'proxy_task_status',
+                            json_build_object(
+                                'task_id', NEW.id,
+                                'status', NEW.status
+                            )::text
+                        );
+                    END IF;
+                    RETURN NEW;
+                END;
+                $$ LANGUAGE plpgsql;
+            """))
+
+        result_trigger = await session.execute(
+            text("SELECT 1 FROM pg_trigger WHERE tgname = 'trg_proxy_task_status_notify'")
+        )
+        if result_trigger.scalar() is None:
+            await session.execute(text("""
+                CREATE TRIGGER trg_proxy_task_status_notify
+                AFTER UPDATE ON proxy_task_queue
+                FOR EACH ROW
+                EXECUTE FUNCTION notify_proxy_task_status();
+            """))
+
+        try:
+            await session.commit()
+        except IntegrityError:
+            await session.rollback()
+            raise
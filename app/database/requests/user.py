@@ -1,19 +1,27 @@
 import logging
 
-from sqlite3 import IntegrityError
 from typing import Optional
 
-from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.exc import SQLAlchemyError, IntegrityError
 
 
 from app.database.db import async_session
 from app.database.models import User
-from sqlalchemy import select, update
+from app.utils.cache import async_ttl_cache
+from sqlalchemy import select, update, bindparam, exists, or_
 
+_USER_EXISTS_STMT = select(exists().where(User.tg_id == bindparam("tg_id")))
+
+USER_CACHE_TTL_SECONDS = 60
+
+
+@async_ttl_cache(ttl=USER_CACHE_TTL_SECONDS, maxsize=1024)
 async def user_exists(tg_id: int) -> bool:
     """
     Check if a user exists by their Telegram ID.
 
+    The result is cached per `tg_id` and invalidated by `add_user`.
+
     Args:
         tg_id (int): Telegram user ID.
 
@@ -21,9 +29,8 @@ async def user_exists(tg_id: int) -> bool:
         bool: True if user exists, False otherwise.
     """
     async with async_session() as session:
-        result = await session.scalar(select(User).where(User.tg_id == tg_id))
-        print(result is not None)
-        return result is not None
+        result = await session.scalar(_USER_EXISTS_STMT, {"tg_id": tg_id})
+        return bool(result)
 
 
 async def add_user(tg_id: int, first_name: str, last_name: str, phone_number: str, username: str):
@@ -39,11 +46,11 @@ async def add_user(tg_id: int, first_name: str, last_name: str, phone_number: st
 
     Raises:
         ValueError: If user with given tg_id already exists.
-        RuntimeError: If insertion fails due to database constraints.
-    """
-    if await user_exists(tg_id):
-        raise ValueError(f"User with ID:{tg_id} already exists. Please contact support!")
 
+    Notes:
+        Existence is not checked up front; the UNIQUE constraint on `tg_id`
+        rejects duplicates, so registration costs a single INSERT.
+    """
     async with async_session() as session:
         new_user = User(
             tg_id=tg_id,
@@ -55,16 +62,22 @@ async def add_user(tg_id: int, first_name: str, last_name: str, phone_number: st
         session.add(new_user)
         try:
             await session.commit()
-            print(f"New user created: {new_user}")
+            user_exists.invalidate(tg_id)
+            get_user.invalidate(tg_id)
+            logging.debug("New user created: %s", tg_id)
         except IntegrityError as e:
             await session.rollback()
-            raise RuntimeError(f"Failed to add user: {e}")
+            raise ValueError(f"User with ID:{tg_id} already exists. Please contact support!") from e
 
 
+@async_ttl_cache(ttl=USER_CACHE_TTL_SECONDS, maxsize=1024)
 async def get_user(tg_id: int) -> User:
     """
     Retrieve a user by their Telegram ID.
 
+    The result is cached per `tg_id` and invalidated whenever the user row is
+    changed through this package (`add_user`, `update_user`, balance updates).
+
     Args:
         tg_id (int): Telegram user ID.
 
@@ -105,8 +118,10 @@ async def update_user(
 
     Notes:
         Fields are updated only if their corresponding parameters are not None.
+        The row is not written at all when every provided value matches the stored one.
         To clear a field (e.g., last_name), pass an empty string explicitly.
-        If no fields are provided for update, the function returns False.
+        If no fields are provided for update, the function returns True without querying the database.
+        Returns False if the user does not exist.
     """
     update_data = {}
 
@@ -123,27 +138,34 @@ async def update_user(
         update_data["phone_number"] = phone_number.strip()
 
     if not update_data:
-        # No data to update
+        # Nothing to write, so there is no reason to touch the database
         logging.warning(f"No update data provided for user {tg_id}")
-        return False
+        return True
 
-    try:
-        async with async_session() as session:
+    async with async_session() as session:
+        try:
             result = await session.execute(
                 update(User)
                 .where(User.tg_id == tg_id)
+                .where(or_(*(
+                    getattr(User, column).is_distinct_from(value)
+                    for column, value in update_data.items()
+                )))
                 .values(**update_data)
             )
             await session.commit()
+        except SQLAlchemyError as e:
+            await session.rollback()
+            logging.error(f"Error updating user {tg_id}: {str(e)}")
+            return False
 
-            if result.rowcount == 0:
-                raise ValueError(f"User with tg_id {tg_id} not found")
+    if result.rowcount:
+        get_user.invalidate(tg_id)
+        return True
 
-            return True
-    except SQLAlchemyError as e:
-        await session.rollback()
-        logging.error(f"Error updating user {tg_id}: {str(e)}")
-        return False
-    except Exception as e:
-        logging.error(f"Critical error: {str(e)}")
+    # Zero rows means either no such user or nothing changed
+    if not await user_exists(tg_id):
+        logging.warning(f"User with tg_id {tg_id} not found")
         return False
+
+    return True
@@ -1,7 +1,7 @@
 from aiogram import types
 from aiogram.filters import BaseFilter
 
-from config import ADMINS
+from app.utils.admin_utils import ADMIN_IDS
 
 class IsAdmin(BaseFilter):
     """
@@ -9,6 +9,10 @@ class IsAdmin(BaseFilter):
 
     Returns:
         bool: True if the sender's user ID is in the ADMINS set, False otherwise.
+
+    Notes:
+        ``__call__`` stays a coroutine: aiogram always awaits ``Filter`` instances,
+        while plain sync callables are dispatched to a worker thread.
     """
     async def __call__(self, message: types.Message) -> bool:
-        return message.from_user.id in ADMINS
\ No newline at end of file
+        return message.from_user.id in ADMIN_IDS
\ No newline at end of file
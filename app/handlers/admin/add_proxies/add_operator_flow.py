@@ -52,8 +52,7 @@ async def process_operator_name(message: Message, state: FSMContext):
         await message.answer("❌ Назва оператора занадто довга. Введіть до 20 символів.")
         return
 
-    await state.update_data(operator_name=name)
-    data = await state.get_data()
+    data = await state.update_data(operator_name=name)
 
     country_code = data["country_code"]
     operator_name = data["operator_name"]
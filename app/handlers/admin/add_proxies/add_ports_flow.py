@@ -1,4 +1,5 @@
 import logging
+import re
 
 from aiogram import Router, F
 from aiogram.fsm.context import FSMContext
@@ -7,11 +8,17 @@ from aiogram.types import CallbackQuery, Message
 
 from app.database.requests.save_data import save_port_list
 from app.filters.isAdmin import IsAdmin
+from app.utils.constants import IPV4_PATTERN
 from app.keyboards.universal_keyboards import get_confirm_or_cancel_keyboard, get_back_keyboard
 from app.menu.menu import send_server_choice_menu, send_admin_panel
 
 router = Router()
 
+_PORTS_INPUT_RE = re.compile(r'[\d\s,\-]+')
+_PORTS_SEPARATOR_RE = re.compile(r'[\s,]+')
+_PORT_RE = re.compile(r'(\d+)(?:-(\d+))?')
+MAX_PORTS_PER_BATCH = 100
+
 class AddPortsState(StatesGroup):
     waiting_for_server_ip_choice = State()
     waiting_for_ports_input_start = State()
@@ -20,13 +27,12 @@ class AddPortsState(StatesGroup):
 
 @router.callback_query(IsAdmin(), F.data == "add_ports")
 async def handle_choice_operators(callback: CallbackQuery, state: FSMContext):
-    await state.clear()
-    await state.update_data(is_port_choice = True)
+    await state.set_data({"is_port_choice": True})
     await send_server_choice_menu(callback, None)
     await state.set_state(AddPortsState.waiting_for_server_ip_choice)
 
 
-@router.callback_query(IsAdmin(), AddPortsState.waiting_for_server_ip_choice, F.data.regexp(r'^(\d{1,3}\.){3}\d{1,3}$'))
+@router.callback_query(IsAdmin(), AddPortsState.waiting_for_server_ip_choice, F.data.regexp(IPV4_PATTERN))
 async def handle_start_adding_ports(callback: CallbackQuery, state: FSMContext):
     await state.update_data(server_ip=callback.data)
     await callback.message.edit_text(
@@ -44,55 +50,47 @@ async def handle_ports_input(message: Message, state: FSMContext):
     await state.set_state(AddPortsState.waiting_for_correct_ports_input)
     try:
         raw_ports = message.text.strip()
-        normalized = raw_ports.replace(',', ' ').replace('\n', ' ')
+        if not _PORTS_INPUT_RE.fullmatch(raw_ports):
+            await message.reply("❌ Невірний формат портів. Дозволені лише числа, пробіли, коми, тире та нові рядки")
+            return
 
-        # Розбиваємо на окремі порти та діапазони
-        port_list = []
-        for item in normalized.split():
-            item = item.strip()
+        # Кожен елемент має бути цілим портом або діапазоном X-Y, інакше повідомляємо адміну
+        ports = set()
+        for item in _PORTS_SEPARATOR_RE.split(raw_ports):
             if not item:
                 continue
 
-            # Обробка діапазону портів (формат: X-Y)
-            if '-' in item:
-                try:
-                    start, end = map(int, item.split('-'))
-                    if start > end:
-                        start, end = end, start  # Автоматично виправляємо порядок
-
-                    if not (1 <= start <= 65535 and 1 <= end <= 65535):
-                        await message.reply(f"⛔ Діапазон {item} містить невалідні порти (має бути 1-65535)")
-                        return
-
-                    port_list.extend(range(start, end + 1))
-                except ValueError:
-                    await message.reply(f"❌ Невірний формат діапазону: {item}")
-                    return
-            else:
-                # Обробка одиночного порту
-                try:
-                    port = int(item)
-                    if 1 <= port <= 65535:
-                        port_list.append(port)
-                    else:
-                        await message.reply(f"⛔ Порт {port} не валідний (має бути 1-65535)")
-                        return
-                except ValueError:
-                    await message.reply(f"❌ Невірний формат порту: {item}")
-                    return
-
-        if not port_list:
-            await message.reply("❌ Не знайдено жодного валідного порту")
-            return
+            match = _PORT_RE.fullmatch(item)
+            if match is None:
+                kind = "діапазону" if '-' in item else "порту"
+                await message.reply(f"❌ Невірний формат {kind}: {item}")
+                return
 
-        # Видаляємо дублікати та сортуємо
-        port_list = sorted(list(set(port_list)))
+            start = int(match.group(1))
+            end = int(match.group(2) or start)
+            if start > end:
+                start, end = end, start  # Автоматично виправляємо порядок
 
-        # Перевірка кількості портів
-        if len(port_list) > 100:
-            await message.reply("⚠️ Забагато портів (максимум 100 за раз)")
+            if not (1 <= start and end <= 65535):
+                await message.reply(f"⛔ Порт або діапазон {match.group(0)} містить невалідні порти (має бути 1-65535)")
+                return
+
+            # Перевіряємо ліміт до розгортання діапазону, щоб не створювати зайві числа
+            if end - start + 1 > MAX_PORTS_PER_BATCH:
+                await message.reply(f"⚠️ Забагато портів (максимум {MAX_PORTS_PER_BATCH} за раз)")
+                return
+
+            ports.update(range(start, end + 1))
+            if len(ports) > MAX_PORTS_PER_BATCH:
+                await message.reply(f"⚠️ Забагато портів (максимум {MAX_PORTS_PER_BATCH} за раз)")
+                return
+
+        if not ports:
+            await message.reply("❌ Не знайдено жодного валідного порту")
             return
 
+        port_list = sorted(ports)
+
         # Оновлюємо стан
         await state.update_data(ports=port_list)
 
@@ -118,10 +116,8 @@ async def handle_confirm_ports_adding(callback: CallbackQuery, state: FSMContext
     data = await state.get_data()
     ports = data['ports']
     server_ip = data['server_ip']
-    from app.database.requests.get_data import get_server_id_by_ip
-    server_id = await get_server_id_by_ip(server_ip)
-    if server_id is not None:
-        success_text = await save_port_list(ports, server_id)
+    success_text = await save_port_list(ports, server_ip)
+    if success_text is not None:
         await callback.message.edit_text(success_text)
     else:
         await callback.message.edit_text("❌ Сервер з вказаною адресою відсутній")
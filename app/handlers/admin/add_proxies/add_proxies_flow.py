@@ -1,18 +1,23 @@
+import re
+
 from aiogram import Router, F
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import StatesGroup, State
 from aiogram.types import CallbackQuery, Message
 
 from app.database.requests.save_data import save_proxies_from_fsm
-from app.database.requests.get_data import get_operator_by_id, get_protocol_by_id
+from app.database.requests.get_data import get_operator_and_protocol
 from app.filters.isAdmin import IsAdmin
+from app.utils.constants import IPV4_PATTERN
+from app.utils.ip import validate_ipv4
 from app.menu.menu import send_admin_panel, send_server_choice_menu, send_operators_choice_menu, \
     send_protocols_choice_menu
 from app.keyboards.universal_keyboards import get_confirm_or_cancel_keyboard
-from app.utils.constants import IPV4_PATTERN
 
 router = Router()
 
+_IP_SEPARATOR_RE = re.compile(r'[,\n]')
+
 
 class AddProxiesState(StatesGroup):
     waiting_for_operators_choice = State()
@@ -30,7 +35,7 @@ async def handle_choice_operators(callback: CallbackQuery, state: FSMContext):
     await send_operators_choice_menu(callback)
 
 
-@router.callback_query(IsAdmin(), AddProxiesState.waiting_for_operators_choice, F.data.regexp(r'^\d+$'))
+@router.callback_query(IsAdmin(), AddProxiesState.waiting_for_operators_choice, F.data.func(str.isdecimal))
 async def handle_choice_protocol(callback: CallbackQuery, state: FSMContext):
     await state.update_data(operator_id=int(callback.data))
     await send_protocols_choice_menu(callback)
@@ -39,14 +44,14 @@ async def handle_choice_protocol(callback: CallbackQuery, state: FSMContext):
 
 
 
-@router.callback_query(IsAdmin(), AddProxiesState.waiting_for_protocol_choice, F.data.regexp(r'^\d+$'))
+@router.callback_query(IsAdmin(), AddProxiesState.waiting_for_protocol_choice, F.data.func(str.isdecimal))
 async def handle_choice_server(callback: CallbackQuery, state: FSMContext):
     await state.update_data(protocol_id=int(callback.data))
     await send_server_choice_menu(callback)
     await state.set_state(AddProxiesState.waiting_for_server_ip_choice)
     await callback.answer()
 
-@router.callback_query(IsAdmin(), AddProxiesState.waiting_for_server_ip_choice, F.data.regexp(r'^(\d{1,3}\.){3}\d{1,3}$'))
+@router.callback_query(IsAdmin(), AddProxiesState.waiting_for_server_ip_choice, F.data.regexp(IPV4_PATTERN))
 async def handle_choice_server_process(callback: CallbackQuery, state: FSMContext):
     await state.update_data(server_ip=callback.data)
     await callback.message.edit_text("Введіть внутрішні IP-адреси у форматі xxx.xxx.xxx.xxx через кому:")
@@ -57,7 +62,7 @@ async def handle_internal_ips_input(message: Message, state: FSMContext):
     raw_input = message.text.strip()
 
     # Підтримка вводу через кому або новий рядок
-    ip_candidates = [ip.strip() for ip in raw_input.replace(',', '\n').split('\n') if ip.strip()]
+    ip_candidates = [ip for ip in map(str.strip, _IP_SEPARATOR_RE.split(raw_input)) if ip]
 
     if not ip_candidates:
         await message.answer("❌ Ви не ввели жодної IP-адреси.")
@@ -65,23 +70,14 @@ async def handle_internal_ips_input(message: Message, state: FSMContext):
 
     valid_ips = []
     for ip in ip_candidates:
-        if not IPV4_PATTERN.match(ip):
+        # Перевіряє формат, діапазон октетів і ведучі нулі одним викликом
+        if not validate_ipv4(ip):
             await message.answer(
-                f"❌ Неправильний формат IP: <code>{ip}</code>\nВведіть усі адреси у форматі xxx.xxx.xxx.xxx.",
+                f"❌ Неправильний формат IP: <code>{ip}</code>\nВведіть усі адреси у форматі xxx.xxx.xxx.xxx "
+                "(октети 0–255, без ведучих нулів).",
                 parse_mode="HTML")
             return
 
-        octets = ip.split('.')
-        for o in octets:
-            if not (0 <= int(o) <= 255):
-                await message.answer(f"❌ IP-адреса <code>{ip}</code> містить октет поза діапазоном 0–255.",
-                                     parse_mode="HTML")
-                return
-            if len(o) > 1 and o.startswith('0'):
-                await message.answer(f"❌ IP-адреса <code>{ip}</code> містить недопустимий ведучий нуль.",
-                                     parse_mode="HTML")
-                return
-
         valid_ips.append(ip)
 
     await state.update_data(internal_ips=valid_ips)
@@ -92,8 +88,7 @@ async def handle_confirm_enters_data(message: Message, state: FSMContext):
     data = await state.get_data()
 
     # Отримуємо деталі для тексту
-    operator = await get_operator_by_id(data["operator_id"])
-    protocol = await get_protocol_by_id(data["protocol_id"])
+    operator, protocol = await get_operator_and_protocol(data["operator_id"], data["protocol_id"])
     server_ip = data["server_ip"]
     internal_ips = data["internal_ips"]
 
@@ -5,9 +5,9 @@ from aiogram.types import Message, CallbackQuery
 
 from app.database.requests.save_data import save_server_ip
 from app.filters.isAdmin import IsAdmin
+from app.utils.ip import validate_ipv4
 from app.handlers.admin.add_proxies.add_ports_flow import AddPortsState
 from app.handlers.admin.add_proxies.add_proxies_flow import AddProxiesState
-from app.utils.constants import IPV4_PATTERN
 from app.handlers.universal import send_confirmation_request_panel
 from app.keyboards.universal_keyboards import get_back_keyboard
 from app.menu.menu import send_server_choice_menu, send_protocols_choice_menu
@@ -27,7 +27,7 @@ async def handle_back_to_servers_choice_menu(callback: CallbackQuery,state: FSMC
     is_port_choice = data.get("is_port_choice")
     if is_port_choice:
         await send_server_choice_menu(callback, None)
-        await state.clear()
+        await state.set_data({"is_port_choice": True})
         await state.set_state(AddPortsState.waiting_for_server_ip_choice)
     else:
         await send_server_choice_menu(callback)
@@ -55,24 +55,13 @@ async def handle_server_ip_input(message: Message, state: FSMContext):
     await state.set_state(AddServerState.waiting_for_correct_ip_input)
     server_ip = message.text.strip()
 
-    # Перевірка формату IP (проста, перевіряє структуру xxx.xxx.xxx.xxx)
-    if not IPV4_PATTERN.match(server_ip):
-        await message.answer("❌ Неправильний формат IP. Будь ласка, введіть IP у форматі xxx.xxx.xxx.xxx (наприклад, 192.168.1.1).")
+    # Перевірка формату IP: структура xxx.xxx.xxx.xxx, октети 0–255, без ведучих нулів
+    if not validate_ipv4(server_ip):
+        await message.answer(
+            "❌ Неправильний формат IP. Будь ласка, введіть IP у форматі xxx.xxx.xxx.xxx (наприклад, 192.168.1.1). "
+            "Кожен октет має бути в діапазоні від 0 до 255 без ведучих нулів.")
         return
 
-    # Додаткова перевірка, щоб кожен октет був від 0 до 255
-    octets = server_ip.split('.')
-
-    for o in octets:
-        if not (0 <= int(o) <= 255):
-            await message.answer("❌ Кожен октет IP має бути в діапазоні від 0 до 255. Спробуйте ще раз.")
-            return
-        # Перевірка ведучих нулів (октет не повинен починатися з 0, якщо це не "0")
-        if len(o) > 1 and o.startswith('0'):
-            await message.answer(
-                "❌ Октети не повинні містити ведучі нулі. Наприклад, '192.168.1.1', а не '192.168.001.01'. Спробуйте ще раз.")
-            return
-
     await state.update_data(new_server_ip=server_ip)
     await state.set_state(AddServerState.waiting_for_server_ip_confirmation)
 
@@ -87,10 +76,8 @@ async def handle_server_ip_input(message: Message, state: FSMContext):
 @router.callback_query(IsAdmin(), AddServerState.waiting_for_server_ip_confirmation, F.data == "confirm_server_data")
 async def handle_save_server_data(callback: CallbackQuery, state: FSMContext):
     data = await state.get_data()
-    server_ip = data.get("new_server_ip")
-    data.pop("new_server_ip", None),
+    server_ip = data.pop("new_server_ip", None)
     is_port_choice = data.get("is_port_choice")
-    await state.set_data(data)
 
     if await save_server_ip(server_ip):
         await callback.message.edit_text(f"✅ Сервер <code>{server_ip}</code> збережено\n\n", parse_mode="HTML")
@@ -98,9 +85,10 @@ async def handle_save_server_data(callback: CallbackQuery, state: FSMContext):
         await callback.message.edit_text(f"❌ Сервер <code>{server_ip}</code> вже існує\n\n", parse_mode="HTML")
     if is_port_choice:
         await send_server_choice_menu(callback.message, None)
-        await state.clear()
+        await state.set_data({"is_port_choice": True})
         await state.set_state(AddPortsState.waiting_for_server_ip_choice)
     else:
+        await state.set_data(data)
         await state.set_state(AddProxiesState.waiting_for_server_ip_choice)
         await send_server_choice_menu(callback.message)
 
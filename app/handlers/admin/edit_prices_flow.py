@@ -37,7 +37,7 @@ async def handle_load_edit_prices(callback: CallbackQuery, state: FSMContext):
     await send_edit_proxies_price_menu(callback, state)
 
 
-@router.callback_query(IsAdmin(), EditPricesStates.waiting_for_products_choice, F.data.regexp(r'^\d+$'))
+@router.callback_query(IsAdmin(), EditPricesStates.waiting_for_products_choice, F.data.func(str.isdecimal))
 async def handle_click_numeric_button(callback: CallbackQuery, state: FSMContext):
     catalog_id = int(callback.data)
 
@@ -1,3 +1,5 @@
+import re
+
 from aiogram import Router, F
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import StatesGroup, State
@@ -5,18 +7,20 @@ from aiogram.types import CallbackQuery
 
 from app.database.requests.get_data import get_all_proxies_info
 from app.filters.isAdmin import IsAdmin
-from app.keyboards.admin.proxy_settings import build_pagination_keyboard
+from app.keyboards.admin.proxy_settings import build_pagination_keyboard, PAGINATION_CALLBACK_RE
 from app.utils.text_generator import get_proxies_admin_list_text
 
 router = Router()
 
+PROXIES_PER_PAGE = 6
+
 class ProxySettingsStates(StatesGroup):
     waiting_for_proxy_choice = State()
 
 @router.callback_query(IsAdmin(), F.data == "proxies_list")
 async def handle_list_proxies(callback: CallbackQuery, state: FSMContext):
-    proxies = await get_all_proxies_info()
-    text, total_pages = get_proxies_admin_list_text(proxies)
+    proxies, total = await get_all_proxies_info(page=1, page_size=PROXIES_PER_PAGE)
+    text, total_pages = get_proxies_admin_list_text(proxies, total, per_page=PROXIES_PER_PAGE)
     await state.set_state(ProxySettingsStates.waiting_for_proxy_choice)
 
     keyboard = build_pagination_keyboard(page=1, total_pages=total_pages)
@@ -24,13 +28,12 @@ async def handle_list_proxies(callback: CallbackQuery, state: FSMContext):
 
 
 
-@router.callback_query(IsAdmin(),ProxySettingsStates.waiting_for_proxy_choice, lambda c: c.data.startswith(("prev_", "next_")))
-async def handle_pagination(callback: CallbackQuery, state: FSMContext):
-    action, page = callback.data.split("_")
-    page = int(page)
+@router.callback_query(IsAdmin(),ProxySettingsStates.waiting_for_proxy_choice, F.data.regexp(PAGINATION_CALLBACK_RE).as_("page_match"))
+async def handle_pagination(callback: CallbackQuery, state: FSMContext, page_match: re.Match):
+    page = int(page_match.group(2))
 
-    proxies = await get_all_proxies_info()
-    text, total_pages = get_proxies_admin_list_text(proxies, page=page)
+    proxies, total = await get_all_proxies_info(page=page, page_size=PROXIES_PER_PAGE)
+    text, total_pages = get_proxies_admin_list_text(proxies, total, page=page, per_page=PROXIES_PER_PAGE)
 
     keyboard = build_pagination_keyboard(page=page, total_pages=total_pages)
     await callback.message.edit_text(text,parse_mode="HTML", reply_markup=keyboard)
@@ -1,14 +1,18 @@
+import re
+
 from aiogram import Router, F
+from aiogram.filters import StateFilter
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import StatesGroup, State
 from aiogram.types import CallbackQuery, InlineKeyboardButton
 
 from app.database.models import TaskStatusEnum
-from app.database.requests.task_handler import get_tasks_by_status, delete_tasks_by_status
+from app.database.requests.task_handler import delete_tasks_by_status, count_tasks_by_status, \
+    get_tasks_by_status_page, invalidate_task_list_cache
 from app.filters.isAdmin import IsAdmin
-from app.keyboards.admin.panel import get_task_queue_choice_keyboard
-from app.keyboards.admin.proxy_settings import build_pagination_keyboard
-from app.keyboards.universal_keyboards import get_confirm_or_cancel_keyboard
+from app.keyboards.admin.panel import TASK_QUEUE_CHOICE_KB, CONFIRM_CLEAR_QUEUE_KB
+from app.keyboards.admin.proxy_settings import build_pagination_keyboard, PAGINATION_CALLBACK_RE
+from app.utils.background import fire_and_forget
 from app.utils.text_generator import get_pending_task_list_text
 
 router = Router()
@@ -18,88 +22,79 @@ class WatchingTasksState(StatesGroup):
     is_watching_error = State()
     is_watching_done = State()
 
-async def render_task_list(callback: CallbackQuery, state: FSMContext, status: TaskStatusEnum, page: int = 1):
-    tasks = await get_tasks_by_status(status)
+# callback prefix -> (task status, FSM state while watching it, tasks per page)
+TASK_QUEUE_VIEWS = {
+    "current": (TaskStatusEnum.pending, WatchingTasksState.is_watching_pending, 3),
+    "error": (TaskStatusEnum.error, WatchingTasksState.is_watching_error, 1),
+    "done": (TaskStatusEnum.done, WatchingTasksState.is_watching_done, 1),
+}
+_VIEWS_BY_STATE = {view[1].state: view for view in TASK_QUEUE_VIEWS.values()}
 
-    if status is TaskStatusEnum.pending:
-        await state.set_state(WatchingTasksState.is_watching_pending)
-        text, total_pages = get_pending_task_list_text(tasks, page=page, per_page=3)
-    elif status is TaskStatusEnum.error:
-        await state.set_state(WatchingTasksState.is_watching_error)
-        text, total_pages = get_pending_task_list_text(tasks, page=page, per_page=1)
-    else:
-        await state.set_state(WatchingTasksState.is_watching_done)
-        text, total_pages = get_pending_task_list_text(tasks, page=page, per_page=1)
+_CLEAR_CONFIRM_TEMPLATE = """
+⚠️ <b>ПІДТВЕРДЖЕННЯ ДІЇ</b> ⚠️
+
+Ви дійсно бажаєте очистити {queue_type}?
+
+{description}
+
+📊 <i>Ця дія є незворотною!</i>
+"""
+# FSM state -> ready confirmation text for clearing that queue
+CLEAR_CONFIRM_TEXTS = {
+    WatchingTasksState.is_watching_pending.state: _CLEAR_CONFIRM_TEMPLATE.format(
+        queue_type="ПОТОЧНУ ЧЕРГУ", description="Усі завдання зі статусом 'очікує' будуть видалені"),
+    WatchingTasksState.is_watching_error.state: _CLEAR_CONFIRM_TEMPLATE.format(
+        queue_type="ЧЕРГУ ПОМИЛОК", description="Усі завдання зі статусом 'помилка' будуть видалені"),
+    WatchingTasksState.is_watching_done.state: _CLEAR_CONFIRM_TEMPLATE.format(
+        queue_type="ЧЕРГУ ВИКОНАНИХ", description="Усі завдання зі статусом 'виконано' будуть видалені"),
+}
+
+
+async def render_task_list(callback: CallbackQuery, state: FSMContext, view: tuple, page: int = 1,
+                           refresh: bool = False):
+    status, watching_state, per_page = view
+    fire_and_forget(callback.answer())
+    await state.set_state(watching_state)
+
+    # Opening a list reads fresh data; page flips reuse the cached count and pages
+    if refresh:
+        invalidate_task_list_cache(status)
+
+    total = await count_tasks_by_status(status)
+    total_pages = (total + per_page - 1) // per_page
+    page = max(1, min(page, total_pages))
+    tasks = await get_tasks_by_status_page(status, (page - 1) * per_page, per_page) if total else []
+    text, total_pages = get_pending_task_list_text(tasks, total, page=page, per_page=per_page)
 
     clear_button = InlineKeyboardButton(text = "🧹 Очистити", callback_data="clear_queue")
     keyboard = build_pagination_keyboard(page=page, total_pages=total_pages, back_callback_data="task_queue", additional_button=clear_button)
     await callback.message.edit_text(text, parse_mode="HTML", reply_markup=keyboard)
-    await callback.answer()
 
 @router.callback_query(IsAdmin(), F.data == "task_queue")
 async def handle_task_queue_choice_option(callback: CallbackQuery, state: FSMContext):
     await state.clear()
-    await callback.message.edit_text("🔘 <b>Оберіть дію:</b> ",parse_mode="HTML", reply_markup=get_task_queue_choice_keyboard())
-
-#pending
-@router.callback_query(IsAdmin(), F.data == "current_tasks_queue")
-async def handle_current_tasks_queue(callback: CallbackQuery, state: FSMContext):
-    await render_task_list(callback, state, TaskStatusEnum.pending, page=1)
-
-@router.callback_query(IsAdmin(), WatchingTasksState.is_watching_pending, lambda c: c.data.startswith(("prev_", "next_")))
-async def handle_pagination_current_tasks_queue(callback: CallbackQuery, state: FSMContext):
-    action, page = callback.data.split("_")
-    await render_task_list(callback, state=state, status=TaskStatusEnum.pending, page=int(page))
-
-#error
-@router.callback_query(IsAdmin(), F.data == "error_tasks_queue")
-async def handle_error_tasks_queue(callback: CallbackQuery, state: FSMContext):
-    await render_task_list(callback, state, TaskStatusEnum.error, page=1)
-
-@router.callback_query(IsAdmin(), WatchingTasksState.is_watching_error, lambda c: c.data.startswith(("prev_", "next_")))
-async def handle_pagination_error_tasks_queue(callback: CallbackQuery, state: FSMContext):
-    action, page = callback.data.split("_")
-    await render_task_list(callback, state=state, status=TaskStatusEnum.error, page=int(page))
-
-#done
-@router.callback_query(IsAdmin(), F.data == "done_tasks_queue")
-async def handle_done_tasks_queue(callback: CallbackQuery, state: FSMContext):
-    await render_task_list(callback, state, TaskStatusEnum.done, page=1)
-
-@router.callback_query(IsAdmin(), WatchingTasksState.is_watching_done, lambda c: c.data.startswith(("prev_", "next_")))
-async def handle_pagination_done_tasks_queue(callback: CallbackQuery, state: FSMContext):
-    action, page = callback.data.split("_")
-    await render_task_list(callback, state=state, status=TaskStatusEnum.done, page=int(page))
+    await callback.message.edit_text("🔘 <b>Оберіть дію:</b> ",parse_mode="HTML", reply_markup=TASK_QUEUE_CHOICE_KB)
+
+@router.callback_query(IsAdmin(), F.data.regexp(r"^(current|error|done)_tasks_queue$").as_("queue_match"))
+async def handle_open_tasks_queue(callback: CallbackQuery, state: FSMContext, queue_match: re.Match):
+    view = TASK_QUEUE_VIEWS[queue_match.group(1)]
+    await render_task_list(callback, state, view, page=1, refresh=True)
+
+@router.callback_query(IsAdmin(), StateFilter(WatchingTasksState), F.data.regexp(PAGINATION_CALLBACK_RE).as_("page_match"))
+async def handle_pagination_tasks_queue(callback: CallbackQuery, state: FSMContext, page_match: re.Match):
+    view = _VIEWS_BY_STATE[await state.get_state()]
+    await render_task_list(callback, state, view, page=int(page_match.group(2)))
 
 @router.callback_query(IsAdmin(), F.data == "clear_queue")
 async def handle_clear_queue(callback: CallbackQuery, state: FSMContext):
     current_state = await state.get_state()
 
-    if current_state == WatchingTasksState.is_watching_pending:
-        queue_type = "ПОТОЧНУ ЧЕРГУ"
-        description = "Усі завдання зі статусом 'очікує' будуть видалені"
-    elif current_state == WatchingTasksState.is_watching_error:
-        queue_type = "ЧЕРГУ ПОМИЛОК"
-        description = "Усі завдання зі статусом 'помилка' будуть видалені"
-    elif current_state == WatchingTasksState.is_watching_done:
-        queue_type = "ЧЕРГУ ВИКОНАНИХ"
-        description = "Усі завдання зі статусом 'виконано' будуть видалені"
-    else:
+    confirmation_text = CLEAR_CONFIRM_TEXTS.get(current_state)
+    if confirmation_text is None:
         await callback.answer("❗ Невідомий тип черги")
         return
 
-    confirmation_text = f"""
-⚠️ <b>ПІДТВЕРДЖЕННЯ ДІЇ</b> ⚠️
-
-Ви дійсно бажаєте очистити {queue_type}?
-
-{description}
-
-📊 <i>Ця дія є незворотною!</i>
-"""
-
-    keyboard = get_confirm_or_cancel_keyboard("confirm_queue_clear", "task_queue")
-    await callback.message.edit_text(confirmation_text, parse_mode="HTML", reply_markup=keyboard)
+    await callback.message.edit_text(confirmation_text, parse_mode="HTML", reply_markup=CONFIRM_CLEAR_QUEUE_KB)
     await callback.answer()
 
 
@@ -118,8 +113,8 @@ async def handle_confirm_clear_queue(callback: CallbackQuery, state: FSMContext)
     else:
         await callback.answer("❗ Невідомий тип черги")
         return
-    await callback.message.edit_text(f"♻️ Видалено {deleted}/{total} записів зі статусом {status}")
     await state.clear()
-    await callback.message.answer("🔘 <b>Оберіть дію:</b> ", parse_mode="HTML",
-                                     reply_markup=get_task_queue_choice_keyboard())
+    await callback.message.edit_text(f"♻️ Видалено {deleted}/{total} записів зі статусом {status}\n\n"
+                                     "🔘 <b>Оберіть дію:</b> ", parse_mode="HTML",
+                                     reply_markup=TASK_QUEUE_CHOICE_KB)
     await callback.answer()
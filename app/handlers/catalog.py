@@ -1,4 +1,6 @@
+import asyncio
 import logging
+from typing import Optional
 
 from aiogram import Router, F
 from aiogram.filters import StateFilter
@@ -6,21 +8,25 @@ from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import StatesGroup, State
 from aiogram.types import CallbackQuery, Message
 
-from app.database.requests.get_data import (get_catalog_item_by_id, get_user_balance_by_tg_id,
-                                            get_first_available_proxy_by_type_id,
-                                            get_first_available_port_id_by_server_id,
-                                            get_current_proxies_price_per_week)
-from app.database.requests.save_data import update_proxy_status, create_proxy_rental, decrease_user_balance, \
-        update_port_status
+from app.database.requests.get_data import get_catalog_item_by_id
+from app.database.requests.save_data import reserve_proxy_rental, RentalReservationStatus
+from app.database.requests.user import get_user
 from app.database.requests.task_handler import add_task_to_queue, wait_for_task_completion
-from app.keyboards.catalog import get_back_catalog_keyboard
-from app.keyboards.universal_keyboards import get_confirm_or_cancel_keyboard
+from app.keyboards.catalog import BACK_CATALOG_KB, CONFIRM_PURCHASE_KB
 from app.menu.menu import send_catalog_page, send_main_menu
+from app.utils.background import fire_and_forget
 from app.utils.login_data_generator import generate_3proxy_credentials
 from app.utils.text_generator import get_catalog_item_text
 
 router = Router()
 
+_RENTAL_DETAILS_TEMPLATE = (
+        "\n📝 <b>Деталі оренди</b>\n"
+        "════════════════════════\n"
+        "⏳ <b>Термін:</b> <code>{term}</code> тижні(в)\n"
+        "💳 <b>Вартість:</b> <code>{price}</code>\n\n"
+        "<b>Підтвердіть оренду:</b>"
+)
 
 class CatalogStates(StatesGroup):
         waiting_for_product_choice: State = State()
@@ -35,13 +41,12 @@ async def handle_catalog_list(callback: CallbackQuery, state: FSMContext):
         await send_catalog_page(callback)
 
 
-@router.callback_query(CatalogStates.waiting_for_product_choice, F.data.regexp(r'^\d+$'))
+@router.callback_query(CatalogStates.waiting_for_product_choice, F.data.func(str.isdecimal))
 async def handle_catalog_product_choice(callback: CallbackQuery, state: FSMContext):
         catalog_id = int(callback.data)
         catalog = await get_catalog_item_by_id(catalog_id)
-        user_balance = await get_user_balance_by_tg_id(callback.from_user.id)
-        await state.update_data(catalog = catalog)
-        await state.update_data(user_balance = user_balance)
+        # У стані зберігаємо лише id, сам товар береться з кешу запитів
+        await state.update_data(catalog_id=catalog_id)
 
         text = get_catalog_item_text(catalog)
         text += (
@@ -51,7 +56,7 @@ async def handle_catalog_product_choice(callback: CallbackQuery, state: FSMConte
                 "▸ <i>Або <code>0</code> для відміни</i>"
         )
 
-        await callback.message.edit_text(text, parse_mode="HTML", reply_markup=get_back_catalog_keyboard())
+        await callback.message.edit_text(text, parse_mode="HTML", reply_markup=BACK_CATALOG_KB)
         await callback.answer()
         await state.set_state(CatalogStates.waiting_for_term_input)
 
@@ -81,15 +86,18 @@ async def handle_price_input(message: Message, state: FSMContext):
                 return
 
         data = await state.get_data()
-        catalog = data.get("catalog")
+        catalog, user = await asyncio.gather(
+                get_catalog_item_by_id(data.get("catalog_id")),
+                get_user(message.from_user.id)
+        )
 
         price = catalog.get("price_per_week") * term
         await state.update_data(term = term)
 
-        if price > data.get("user_balance"):
+        if price > user.balance:
                 error_text = (
                         "⚠️ <b>Недостатньо коштів на балансі</b>\n\n"
-                        f"💳 <b>Ваш баланс:</b> <code>{data.get('user_balance')}</code>\n"
+                        f"💳 <b>Ваш баланс:</b> <code>{user.balance}</code>\n"
                         f"💲 <b>Вартість оренди:</b> <code>{price}</code>\n\n"
                         "ℹ️ Оберіть менший термін оренди:\n"
                         "✖️ Або <code>0</code> для виходу в меню"
@@ -102,91 +110,11 @@ async def handle_price_input(message: Message, state: FSMContext):
 
         await state.set_state(CatalogStates.waiting_for_confirm)
 
-        text = get_catalog_item_text(catalog)
-        text += (
-                "\n📝 <b>Деталі оренди</b>\n"
-                "════════════════════════\n"
-                f"⏳ <b>Термін:</b> <code>{term}</code> тижні(в)\n"
-                f"💳 <b>Вартість:</b> <code>{price}</code>\n\n"
-                "<b>Підтвердіть оренду:</b>"
-        )
-        keyboard= get_confirm_or_cancel_keyboard("confirm_purchase","proxy_catalog")
-
-        await message.answer(text=text, parse_mode="HTML", reply_markup=keyboard)
+        text = get_catalog_item_text(catalog) + _RENTAL_DETAILS_TEMPLATE.format(term=term, price=price)
+        await message.answer(text=text, parse_mode="HTML", reply_markup=CONFIRM_PURCHASE_KB)
 
 
-@router.callback_query(CatalogStates.waiting_for_confirm, F.data == "confirm_purchase")
-async def handle_confirm_purchase(callback: CallbackQuery, state: FSMContext):
-    await callback.message.edit_text(" ⏳ Зачекайте...")
-    try:
-        data = await state.get_data()
-        catalog = data.get("catalog")
-        term = data.get("term")
-
-        if not catalog or not term:
-            raise RuntimeError("❌ Дані про товар втрачено. Спробуйте ще раз.")
-
-        proxy_type_id = catalog.get("proxy_type_id")
-        proxy = await get_first_available_proxy_by_type_id(proxy_type_id)
-        if not proxy:
-            raise RuntimeError("😔 Вільних проксі цього типу зараз немає.")
-
-        server_id = proxy.get("server_id")
-        port_id = await get_first_available_port_id_by_server_id(server_id)
-        if not port_id:
-            raise RuntimeError("😔 Вільних проксі цього типу зараз немає.")
-
-        current_price_per_week = await get_current_proxies_price_per_week(catalog.get("id"))
-        if not current_price_per_week:
-            raise RuntimeError("❌ Не вдалося отримати актуальну ціну. Спробуйте ще раз.")
-
-        total_price = current_price_per_week * term
-        user_balance = await get_user_balance_by_tg_id(callback.from_user.id)
-        if user_balance is None:
-            raise RuntimeError("🔍 Не вдалося отримати інформацію про ваш баланс.")
-        if user_balance < total_price:
-            raise RuntimeError(
-                f"💰 Недостатньо коштів для покупки.\n\n"
-                f"Ваш баланс: {user_balance:.2f}\n"
-                f"Вартість оренди: {total_price:.2f}\n\n"
-                f"Будь ласка, поповніть баланс."
-            )
-
-        login_data = await generate_3proxy_credentials()
-        if not login_data:
-            raise RuntimeError("🔑 Помилка при генерації облікових даних.")
-
-        if not await decrease_user_balance(callback.from_user.id, total_price):
-            raise RuntimeError("💳 Помилка при списанні коштів. Зв'яжіться з підтримкою.")
-
-        proxy_id = proxy.get("id")
-        rental = await create_proxy_rental(
-            tg_id=callback.from_user.id,
-            proxy_id=proxy_id,
-            term=term,
-            port_id=port_id,
-            login=login_data.get("login"),
-            password=login_data.get("password")
-        )
-        if not rental:
-            raise RuntimeError("⏳ Помилка при створенні оренди. Зв'яжіться з підтримкою.")
-
-        if not await update_proxy_status(proxy_id, "Rented"):
-            raise RuntimeError("⚠️ Не вдалося забронювати проксі. Спробуйте ще раз.")
-
-        if not await update_port_status(port_id, "Rented"):
-            raise RuntimeError("⚠️ Не вдалося забронювати порт. Спробуйте ще раз.")
-
-        task_id = await add_task_to_queue(
-            proxy_id=proxy_id,
-            port_id=port_id,
-            login=login_data.get("login"),
-            password=login_data.get("password")
-        )
-
-        if not task_id or not await wait_for_task_completion(task_id, timeout=5):
-            raise RuntimeError(
-"""
+_PURCHASE_TIMEOUT_TEXT = """
 ⏳ Час очікування вичерпано!
 
 Не вдалося завершити обробку вашого запиту.
@@ -201,32 +129,83 @@ async def handle_confirm_purchase(callback: CallbackQuery, state: FSMContext):
 
 📌 Ми вже працюємо над вирішенням цієї ситуації!
 """
-            )
 
 
-        await callback.message.edit_text(
-            "🎉 Вітаємо з успішною покупкою!\n\n"
-            "Перейдіть в <b>📊 Мої проксі</b>\n", parse_mode="HTML"
+async def _attempt_purchase(callback: CallbackQuery, state: FSMContext) -> Optional[str]:
+    """Оформлює оренду; повертає текст помилки для користувача або None у разі успіху."""
+    data = await state.get_data()
+    term = data.get("term")
+    catalog = await get_catalog_item_by_id(data["catalog_id"]) if "catalog_id" in data else None
+
+    if not catalog or not term:
+        return "❌ Дані про товар втрачено. Спробуйте ще раз."
+
+    login_data = await generate_3proxy_credentials()
+    if not login_data:
+        return "🔑 Помилка при генерації облікових даних."
+
+    # Бронювання проксі та порту, списання коштів і створення оренди - одна транзакція
+    reservation = await reserve_proxy_rental(
+        tg_id=callback.from_user.id,
+        catalog_id=catalog.get("id"),
+        proxy_type_id=catalog.get("proxy_type_id"),
+        term=term,
+        login=login_data.get("login"),
+        password=login_data.get("password")
+    )
+    status = reservation["status"]
+    if status in (RentalReservationStatus.NO_PROXY, RentalReservationStatus.NO_PORT):
+        return "😔 Вільних проксі цього типу зараз немає."
+    if status is RentalReservationStatus.NO_PRICE:
+        return "❌ Не вдалося отримати актуальну ціну. Спробуйте ще раз."
+    if status is RentalReservationStatus.NO_USER:
+        return "🔍 Не вдалося отримати інформацію про ваш баланс."
+    if status is RentalReservationStatus.INSUFFICIENT_BALANCE:
+        return (
+            f"💰 Недостатньо коштів для покупки.\n\n"
+            f"Ваш баланс: {reservation['balance']:.2f}\n"
+            f"Вартість оренди: {reservation['total_price']:.2f}\n\n"
+            f"Будь ласка, поповніть баланс."
         )
-        await state.clear()
-        await send_main_menu(callback.from_user.id, message=callback.message)
 
-    except RuntimeError as user_error:
-        await callback.message.edit_text(str(user_error), parse_mode="HTML")
-        await state.set_state(CatalogStates.waiting_for_product_choice)
-        await send_catalog_page(callback.message)
+    task_id = await add_task_to_queue(
+        proxy_id=reservation["proxy_id"],
+        port_id=reservation["port_id"],
+        login=login_data.get("login"),
+        password=login_data.get("password")
+    )
+
+    if not task_id or not await wait_for_task_completion(task_id, timeout=5):
+        return _PURCHASE_TIMEOUT_TEXT
+
+    return None
 
-    except Exception as e:
-        logging.exception(f"Unhandled error in handle_confirm_purchase: {e}")
+
+@router.callback_query(CatalogStates.waiting_for_confirm, F.data == "confirm_purchase")
+async def handle_confirm_purchase(callback: CallbackQuery, state: FSMContext):
+    fire_and_forget(callback.answer())
+    await callback.message.edit_text(" ⏳ Зачекайте...")
+    try:
+        error_text = await _attempt_purchase(callback, state)
+    except Exception:
+        logging.exception("Unhandled error in handle_confirm_purchase")
         await callback.message.edit_text(
             "⚡️ Сталася неочікувана помилка. Ми вже працюємо над вирішенням.\n"
             "Будь ласка, спробуйте пізніше або зверніться до підтримки."
         )
         await state.set_state(CatalogStates.waiting_for_product_choice)
         await send_catalog_page(callback.message)
+        return
 
-
-
-
-
-
+    if error_text:
+        await callback.message.edit_text(error_text, parse_mode="HTML")
+        await state.set_state(CatalogStates.waiting_for_product_choice)
+        await send_catalog_page(callback.message)
+        return
+
+    await callback.message.edit_text(
+        "🎉 Вітаємо з успішною покупкою!\n\n"
+        "Перейдіть в <b>📊 Мої проксі</b>\n", parse_mode="HTML"
+    )
+    await state.clear()
+    await send_main_menu(callback.from_user.id, message=callback.message)
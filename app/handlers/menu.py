@@ -4,9 +4,12 @@ from aiogram.fsm.context import FSMContext
 from aiogram.types import Message, CallbackQuery, ReplyKeyboardRemove
 
 from app.handlers.profile_settings import EditSettingsStates
-from app.keyboards.registration import get_registration_keyboard
+from app.keyboards.registration import REGISTRATION_KB
+from app.keyboards.universal_keyboards import BACK_TO_MENU_TEXT
 from app.database.requests.user import user_exists
 from app.menu.menu import send_main_menu
+from app.utils.background import fire_and_forget
+from app.utils.cleanup import delete_tracked_messages
 from config import BOT_NAME
 
 router = Router()
@@ -14,13 +17,9 @@ router = Router()
 
 @router.message(CommandStart())
 async def start_handler(message: Message, state: FSMContext,bot:Bot):
+    data = await state.get_data()
     await state.clear()
-
-    for msg_id in [message.message_id - 1, message.message_id - 2]:
-        try:
-            await bot.delete_message(chat_id=message.chat.id, message_id=msg_id)
-        except Exception:
-            continue
+    fire_and_forget(delete_tracked_messages(bot, message.chat.id, state, data))
 
     # Привітання
     welcome_text = (
@@ -34,25 +33,22 @@ async def start_handler(message: Message, state: FSMContext,bot:Bot):
     if not await user_exists(message.from_user.id):
         await message.answer(
             f"Для доступу до {BOT_NAME} вам необхідно завершити реєстрацію",
-            reply_markup=get_registration_keyboard()
+            reply_markup=REGISTRATION_KB
         )
     else:
         await send_main_menu(tg_id=message.from_user.id, message=message)
 
 
-@router.message(EditSettingsStates.waiting_for_changes, F.text == "Повернутися в меню")
+@router.message(EditSettingsStates.waiting_for_changes, F.text == BACK_TO_MENU_TEXT)
 async def back_from_settings_handler(message: Message, state: FSMContext, bot: Bot):
+    data = await state.get_data()
     await state.clear()
     await message.answer("Головне меню", reply_markup=ReplyKeyboardRemove())
 
     await send_main_menu(tg_id=message.from_user.id, message=message)
 
-    # Спроба видалити попередні повідомлення
-    for msg_id in [message.message_id - 1, message.message_id - 2]:
-        try:
-            await bot.delete_message(chat_id=message.chat.id, message_id=msg_id)
-        except Exception:
-            continue
+    # Видаляємо повідомлення, надіслані в налаштуваннях профілю
+    fire_and_forget(delete_tracked_messages(bot, message.chat.id, state, data))
 
 
 @router.callback_query(F.data == "back_to_menu")
@@ -1,10 +1,12 @@
+import re
+
 from aiogram import Router, F
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import StatesGroup, State
 from aiogram.types import CallbackQuery
 
-from app.database.requests.get_data import get_user_id_by_tg_id, get_user_proxies_list
-from app.keyboards.admin.proxy_settings import build_pagination_keyboard
+from app.database.requests.get_data import get_user_proxies_list_by_tg_id
+from app.keyboards.admin.proxy_settings import build_pagination_keyboard, PAGINATION_CALLBACK_RE
 from app.menu.menu import send_my_proxies_page
 from app.utils.text_generator import get_proxies_user_list_text
 
@@ -19,13 +21,11 @@ async def handle_my_proxies_page_load(callback: CallbackQuery, state: FSMContext
     await send_my_proxies_page(callback)
     await callback.answer()
 
-@router.callback_query(MyProxiesStates.watching_proxies,lambda c: c.data.startswith(("prev_", "next_")))
-async def handle_pagination(callback: CallbackQuery):
-    action, page = callback.data.split("_")
-    page = int(page)
+@router.callback_query(MyProxiesStates.watching_proxies, F.data.regexp(PAGINATION_CALLBACK_RE).as_("page_match"))
+async def handle_pagination(callback: CallbackQuery, page_match: re.Match):
+    page = int(page_match.group(2))
 
-    user_id = await get_user_id_by_tg_id(callback.from_user.id)
-    user_proxies = await get_user_proxies_list(user_id)
+    user_proxies = await get_user_proxies_list_by_tg_id(callback.from_user.id)
     text, total_pages = get_proxies_user_list_text(user_proxies, page=page)
 
     keyboard = build_pagination_keyboard(page=page, total_pages=total_pages, back_callback_data="back_to_menu")
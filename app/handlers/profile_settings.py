@@ -8,8 +8,10 @@ from aiogram.types import Message, CallbackQuery, ReplyKeyboardRemove, ReplyKeyb
 
 from app.database.requests.user import update_user
 from app.menu.menu import send_main_menu
-from app.keyboards.menu import get_support_keyboard, get_back_reply_button
+from app.keyboards.menu import SUPPORT_KB, get_back_reply_button
 from app.keyboards.registration import get_contact_reply_button
+from app.utils.background import fire_and_forget
+from app.utils.cleanup import delete_tracked_messages, track_for_cleanup
 
 router = Router()
 
@@ -29,17 +31,17 @@ async def profile_settings_handler(callback: CallbackQuery, state: FSMContext):
     keyboard = ReplyKeyboardMarkup(keyboard=buttons,
                                    resize_keyboard=True,
                                    one_time_keyboard=True)
-    await callback.message.answer(
+    sent = await callback.message.answer(
         ("Натисніть кнопку нижче:"),
         reply_markup=keyboard
     )
-    print(state.get_state())
+    await track_for_cleanup(state, callback.message.message_id, sent.message_id)
     await callback.answer()
 
 @router.message(EditSettingsStates.waiting_for_changes, F.contact)
 async def process_contact_handler(message: Message, state: FSMContext, bot: Bot):
     contact = message.contact
-    logging.info(f"Contact: {contact}")
+    logging.info("Contact: %s", contact)
 
     try:
         await update_user(contact.user_id, contact.first_name, contact.last_name, contact.phone_number, message.from_user.username)
@@ -48,12 +50,7 @@ async def process_contact_handler(message: Message, state: FSMContext, bot: Bot)
             reply_markup=ReplyKeyboardRemove()
         )
         await send_main_menu(tg_id=message.from_user.id, message=message)
-
-        try:
-            await bot.delete_message(message.chat.id, message.message_id - 1)
-            await bot.delete_message(message.chat.id, message.message_id - 2)
-        except Exception:
-            pass
+        fire_and_forget(delete_tracked_messages(bot, message.chat.id, state, await state.get_data()))
 
     except ValueError as e:
         await message.answer(
@@ -63,6 +60,6 @@ async def process_contact_handler(message: Message, state: FSMContext, bot: Bot)
 
         await message.answer(
             f"❗ {str(e)}",
-            reply_markup=get_support_keyboard()
+            reply_markup=SUPPORT_KB
         )
     await state.clear()
\ No newline at end of file
@@ -4,12 +4,12 @@ from aiogram import Router, F
 from aiogram.filters import StateFilter
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import StatesGroup, State
-from aiogram.types import Message, CallbackQuery, ReplyKeyboardRemove, ReplyKeyboardMarkup, InlineKeyboardMarkup
+from aiogram.types import Message, CallbackQuery, ReplyKeyboardRemove, ReplyKeyboardMarkup
 from app.database.requests.user import add_user, get_user
-from app.keyboards.menu import get_support_keyboard, get_menu_buttons
+from app.keyboards.menu import SUPPORT_KB, MAIN_MENU_KB, ADMIN_MAIN_MENU_KB
 
 from app.keyboards.registration import (
-    get_accept_terms_button, get_contact_reply_button
+    ACCEPT_TERMS_KB, get_contact_reply_button
 )
 from app.utils.admin_utils import is_admin
 from app.utils.text_generator import get_profile_text
@@ -25,7 +25,7 @@ async def register_handler(callback: CallbackQuery, state: FSMContext):
     await state.set_state(RegistrationStates.waiting_for_accept_terms)
     await callback.message.edit_text(
         "📝 Ознайомтесь з угодою використання:",
-        reply_markup=InlineKeyboardMarkup(inline_keyboard=get_accept_terms_button())
+        reply_markup=ACCEPT_TERMS_KB
     )
 
 
@@ -49,7 +49,7 @@ async def accept_terms_handler(callback: CallbackQuery, state: FSMContext):
 @router.message(StateFilter(None), F.contact)
 async def process_contact(message: Message, state: FSMContext):
     contact = message.contact
-    logging.info(f"Contact: {contact}")
+    logging.info("Contact: %s", contact)
 
     try:
         await add_user(contact.user_id, contact.first_name, contact.last_name, contact.phone_number, message.from_user.username)
@@ -65,7 +65,7 @@ async def process_contact(message: Message, state: FSMContext):
         )
         user = await get_user(contact.user_id)
         text = get_profile_text(user)
-        keyboard = InlineKeyboardMarkup(inline_keyboard=(get_menu_buttons(is_admin(message.from_user.id))))
+        keyboard = ADMIN_MAIN_MENU_KB if is_admin(message.from_user.id) else MAIN_MENU_KB
         await message.answer(text, parse_mode="HTML", reply_markup=keyboard)
     except ValueError as e:
         await message.answer(
@@ -75,6 +75,6 @@ async def process_contact(message: Message, state: FSMContext):
 
         await message.answer(
             f"❗ {str(e)}",
-            reply_markup=get_support_keyboard()
+            reply_markup=SUPPORT_KB
         )
 
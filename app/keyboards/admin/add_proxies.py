@@ -1,5 +1,7 @@
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 
+from app.keyboards.universal_keyboards import CANCEL_BUTTON_TEXT
+
 def get_operator_list_keyboard(count: int) -> InlineKeyboardMarkup:
     """
     Повертає клавіатуру з динамічними числовими кнопками та двома фіксованими:
@@ -9,66 +11,52 @@ def get_operator_list_keyboard(count: int) -> InlineKeyboardMarkup:
     :param count: Кількість числових кнопок
     :return: InlineKeyboardMarkup
     """
-    keyboard = InlineKeyboardMarkup(inline_keyboard=[])
-
     # Додавання числових кнопок по 4 в ряд
-    row = []
-    for i in range(1, count + 1):
-        row.append(InlineKeyboardButton(text=str(i), callback_data=str(i)))
-        if len(row) == 4:
-            keyboard.inline_keyboard.append(row)
-            row = []
-    if row:
-        keyboard.inline_keyboard.append(row)
+    buttons = [InlineKeyboardButton(text=str(i), callback_data=str(i)) for i in range(1, count + 1)]
+    rows = [buttons[i:i + 4] for i in range(0, len(buttons), 4)]
 
     # Додавання постійних кнопок
-    keyboard.inline_keyboard.append([
+    rows.append([
         InlineKeyboardButton(
             text="➕ Додати оператора",
             callback_data="add_operator"
         )
     ])
-    keyboard.inline_keyboard.append([
+    rows.append([
         InlineKeyboardButton(
             text="🔙 Назад до панелі",
             callback_data="admin_panel"
         )
     ])
 
-    return keyboard
+    return InlineKeyboardMarkup(inline_keyboard=rows)
 
 def get_servers_ip_list_keyboard(server_ips: list, back_button_callback_data: str = None, back_button_text:str=None) -> InlineKeyboardMarkup:
-    keyboard = InlineKeyboardMarkup(inline_keyboard=[])
-
-    # Додавання числових кнопок по 4 в ряд
-    row = []
-    for ip in server_ips:
-        row.append(InlineKeyboardButton(text=ip, callback_data=ip))
-        keyboard.inline_keyboard.append(row)
-        row = []
+    # Кнопка для кожного сервера в окремому ряду
+    rows = [[InlineKeyboardButton(text=ip, callback_data=ip)] for ip in server_ips]
 
     # Додавання постійних кнопок
-    keyboard.inline_keyboard.append([
+    rows.append([
         InlineKeyboardButton(
             text="➕ Додати сервер",
             callback_data="add_server"
         )
     ])
     if back_button_callback_data is not None:
-        keyboard.inline_keyboard.append([
+        rows.append([
             InlineKeyboardButton(
                 text=back_button_text,
                 callback_data=back_button_callback_data
             )
         ])
-    keyboard.inline_keyboard.append([
+    rows.append([
         InlineKeyboardButton(
-            text="❌ Скасувати",
+            text=CANCEL_BUTTON_TEXT,
             callback_data="admin_panel"
         )
     ])
 
-    return keyboard
+    return InlineKeyboardMarkup(inline_keyboard=rows)
 
 
 def get_confirm_add_operator_keyboard() -> InlineKeyboardMarkup:
@@ -78,32 +66,28 @@ def get_confirm_add_operator_keyboard() -> InlineKeyboardMarkup:
             InlineKeyboardButton(text="✏️ Редагувати", callback_data="edit_add_operator")
         ],
         [
-            InlineKeyboardButton(text="❌ Скасувати", callback_data="add_proxies")
+            InlineKeyboardButton(text=CANCEL_BUTTON_TEXT, callback_data="add_proxies")
         ]
     ])
 
 
 def get_protocols_list_keyboard(protocols: list) -> InlineKeyboardMarkup:
-    keyboard = InlineKeyboardMarkup(inline_keyboard=[])
-
-    for protocol in protocols:
-        btn = InlineKeyboardButton(
-            text=protocol["value"],
-            callback_data=str(protocol["id"])
-        )
-        keyboard.inline_keyboard.append([btn])
+    rows = [
+        [InlineKeyboardButton(text=protocol["value"], callback_data=str(protocol["id"]))]
+        for protocol in protocols
+    ]
 
-    keyboard.inline_keyboard.append([
+    rows.append([
         InlineKeyboardButton(
             text="🔙 Назад до операторів",
             callback_data="add_proxies"
         )
     ])
-    keyboard.inline_keyboard.append([
+    rows.append([
         InlineKeyboardButton(
-            text="❌ Скасувати",
+            text=CANCEL_BUTTON_TEXT,
             callback_data="admin_panel"
         )
     ])
 
-    return keyboard
+    return InlineKeyboardMarkup(inline_keyboard=rows)
@@ -1,5 +1,7 @@
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 
+from app.keyboards.universal_keyboards import get_confirm_or_cancel_keyboard, get_back_button
+
 
 def get_admin_panel_keyboard() -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(
@@ -36,12 +38,7 @@ def get_admin_panel_keyboard() -> InlineKeyboardMarkup:
                     callback_data="task_queue"
                 )
             ],
-            [
-                InlineKeyboardButton(
-                    text="🔙 Повернутися",
-                    callback_data="back_to_menu"
-                )
-            ]
+            [get_back_button("back_to_menu")]
         ]
     )
 
@@ -67,12 +64,11 @@ def get_task_queue_choice_keyboard() -> InlineKeyboardMarkup:
                     callback_data="error_tasks_queue"
                 ),
             ],
-            [
-                InlineKeyboardButton(
-                    text="🔙 Повернутися",
-                    callback_data="admin_panel"
-                )
-            ]
+            [get_back_button("admin_panel")]
         ]
     )
 
+
+ADMIN_PANEL_KB = get_admin_panel_keyboard()
+TASK_QUEUE_CHOICE_KB = get_task_queue_choice_keyboard()
+CONFIRM_CLEAR_QUEUE_KB = get_confirm_or_cancel_keyboard("confirm_queue_clear", "task_queue")
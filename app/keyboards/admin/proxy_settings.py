@@ -1,13 +1,37 @@
+import re
+from functools import lru_cache
 from typing import Optional
 
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 
+from app.keyboards.universal_keyboards import get_back_button
+
+# callback_data кнопок пагінації: prev_<сторінка> / next_<сторінка>
+PAGINATION_CALLBACK_RE = re.compile(r"^(prev|next)_(\d+)$")
+
 
 def build_pagination_keyboard(
     page: int,
     total_pages: int,
     back_callback_data: str = "admin_panel",
     additional_button: Optional[InlineKeyboardButton] = None
+) -> InlineKeyboardMarkup:
+    # Без додаткової кнопки клавіатура залежить лише від простих аргументів, тож її можна кешувати
+    if additional_button is None:
+        return _build_pagination_keyboard_cached(page, total_pages, back_callback_data)
+    return _build_pagination_keyboard(page, total_pages, back_callback_data, additional_button)
+
+
+@lru_cache(maxsize=1024)
+def _build_pagination_keyboard_cached(page: int, total_pages: int, back_callback_data: str) -> InlineKeyboardMarkup:
+    return _build_pagination_keyboard(page, total_pages, back_callback_data)
+
+
+def _build_pagination_keyboard(
+    page: int,
+    total_pages: int,
+    back_callback_data: str,
+    additional_button: Optional[InlineKeyboardButton] = None
 ) -> InlineKeyboardMarkup:
     keyboard = []
 
@@ -26,8 +50,6 @@ def build_pagination_keyboard(
     if additional_button:
         keyboard.append([additional_button])
 
-    keyboard.append([
-        InlineKeyboardButton(text="🔙 Повернутися", callback_data=back_callback_data)
-    ])
+    keyboard.append([get_back_button(back_callback_data)])
 
     return InlineKeyboardMarkup(inline_keyboard=keyboard)
\ No newline at end of file
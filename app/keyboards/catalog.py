@@ -1,7 +1,10 @@
-from typing import List, Dict
+from functools import lru_cache
+from typing import List, Dict, Tuple
 
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 
+from app.keyboards.universal_keyboards import get_confirm_or_cancel_keyboard, get_back_button
+
 def get_catalog_number_keyboard(catalog_list: List[Dict[str, str]], menu_callback_data: str = "back_to_menu") -> InlineKeyboardMarkup:
     """
     Генерує Inline-клавіатуру з числом кнопок, що відповідає параметру count.
@@ -10,33 +13,27 @@ def get_catalog_number_keyboard(catalog_list: List[Dict[str, str]], menu_callbac
     :param count: Кількість кнопок
     :return: InlineKeyboardMarkup з кнопками від 1 до count
     """
-    keyboard = InlineKeyboardMarkup(inline_keyboard=[])
-
-    row = []
-    for item in catalog_list:
-        row.append(InlineKeyboardButton(text=str(item['catalog_id']), callback_data=str(item['catalog_id'])))
-        if len(row) == 4:
-            keyboard.inline_keyboard.append(row)
-            row = []
-    if row:
-        keyboard.inline_keyboard.append(row)
-
-    keyboard.inline_keyboard.append([
-        InlineKeyboardButton(
-            text="🔙 Повернутися",
-            callback_data=menu_callback_data
-        )
-    ])
-
-    return keyboard
+    # Клавіатура залежить лише від набору id, тож однакові каталоги отримують спільну розмітку
+    return _build_catalog_number_keyboard(tuple(item['catalog_id'] for item in catalog_list), menu_callback_data)
+
+
+@lru_cache(maxsize=64)
+def _build_catalog_number_keyboard(catalog_ids: Tuple[int, ...], menu_callback_data: str) -> InlineKeyboardMarkup:
+    ids = [str(catalog_id) for catalog_id in catalog_ids]
+    rows = [
+        [InlineKeyboardButton(text=catalog_id, callback_data=catalog_id) for catalog_id in ids[i:i + 4]]
+        for i in range(0, len(ids), 4)
+    ]
+
+    rows.append([get_back_button(menu_callback_data)])
+
+    return InlineKeyboardMarkup(inline_keyboard=rows)
 
 def get_back_catalog_keyboard() -> InlineKeyboardMarkup:
      return InlineKeyboardMarkup(
-             inline_keyboard=[[
-                InlineKeyboardButton(
-                    text="🔙 Повернутися",
-                    callback_data="proxy_catalog"
-                )
-         ]]
+             inline_keyboard=[[get_back_button("proxy_catalog")]]
      )
 
+
+BACK_CATALOG_KB = get_back_catalog_keyboard()
+CONFIRM_PURCHASE_KB = get_confirm_or_cancel_keyboard("confirm_purchase", "proxy_catalog")
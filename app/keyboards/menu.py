@@ -1,53 +1,55 @@
 from aiogram.types import (InlineKeyboardMarkup, InlineKeyboardButton, KeyboardButton)
 
+from app.keyboards.universal_keyboards import BACK_TO_MENU_TEXT
 from config import SUPPORT_CHAT
 
-def get_menu_buttons(is_admin: bool = False) -> list:
-    buttons = [
-        [
-            InlineKeyboardButton(
-                text="🛍️ Каталог проксі",
-                callback_data="proxy_catalog"
-            ),
-            InlineKeyboardButton(
-                text="📊 Мої проксі",
-                callback_data="my_proxies"
-            )
-        ],
-        [
-            InlineKeyboardButton(
-                text="💳 Поповнити баланс",
-                callback_data="top_up_balance"
-            ),
-            InlineKeyboardButton(
-                text="🛠️ Техпідтримка",
-                url=f"https://t.me/{SUPPORT_CHAT}"
-            )
-        ],
-        [
-            InlineKeyboardButton(
-                text="⚙ Налаштування",
-                callback_data="profile_settings"
-            )
-        ]
+# Ряди головного меню будуються один раз під час імпорту
+_MENU_BUTTONS_USER = [
+    [
+        InlineKeyboardButton(
+            text="🛍️ Каталог проксі",
+            callback_data="proxy_catalog"
+        ),
+        InlineKeyboardButton(
+            text="📊 Мої проксі",
+            callback_data="my_proxies"
+        )
+    ],
+    [
+        InlineKeyboardButton(
+            text="💳 Поповнити баланс",
+            callback_data="top_up_balance"
+        ),
+        InlineKeyboardButton(
+            text="🛠️ Техпідтримка",
+            url=f"https://t.me/{SUPPORT_CHAT}"
+        )
+    ],
+    [
+        InlineKeyboardButton(
+            text="⚙ Налаштування",
+            callback_data="profile_settings"
+        )
     ]
+]
+# Додаємо окремий рядок з кнопкою для адміна
+_MENU_BUTTONS_ADMIN = _MENU_BUTTONS_USER + [
+    [
+        InlineKeyboardButton(
+            text="🛡️ Адмін панель",
+            callback_data="admin_panel"
+        )
+    ]
+]
 
-    if is_admin:
-        # Додаємо окремий рядок з кнопкою для адміна
-        buttons.append([
-            InlineKeyboardButton(
-                text="🛡️ Адмін панель",
-                callback_data="admin_panel"
-            )
-        ])
-
-    return buttons
+def get_menu_buttons(is_admin: bool = False) -> list:
+    return _MENU_BUTTONS_ADMIN if is_admin else _MENU_BUTTONS_USER
 
 def get_back_reply_button() -> list:
     return [
         [
             KeyboardButton(
-                text="Повернутися в меню"
+                text=BACK_TO_MENU_TEXT
             )
         ]
     ]
@@ -60,3 +62,7 @@ def get_support_keyboard() -> InlineKeyboardMarkup:
                 )
     ]])
 
+
+MAIN_MENU_KB = InlineKeyboardMarkup(inline_keyboard=get_menu_buttons())
+ADMIN_MAIN_MENU_KB = InlineKeyboardMarkup(inline_keyboard=get_menu_buttons(is_admin=True))
+SUPPORT_KB = get_support_keyboard()
@@ -1,5 +1,7 @@
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton, WebAppInfo, ReplyKeyboardMarkup, KeyboardButton
 
+from app.keyboards.universal_keyboards import BACK_TO_MENU_TEXT
+
 
 def get_accept_terms_button() -> list:
     return [
@@ -37,7 +39,7 @@ def get_contact_keyboard_settings():
             ],
             [
                 KeyboardButton(
-                    text="Повернутися в меню"
+                    text=BACK_TO_MENU_TEXT
                 )
             ]
         ],
@@ -57,3 +59,7 @@ def get_registration_keyboard():
             ]
         ]
     )
+
+
+REGISTRATION_KB = get_registration_keyboard()
+ACCEPT_TERMS_KB = InlineKeyboardMarkup(inline_keyboard=get_accept_terms_button())
@@ -1,21 +1,41 @@
+from functools import lru_cache
 from typing import Optional
 
 from aiogram.types import InlineKeyboardMarkup, InlineKeyboardButton
 
+# Клавіатури в app/keyboards (константи *_KB, спільні кнопки та результати функцій з lru_cache)
+# створюються один раз і спільні для всіх обробників - не змінюйте їх після створення
 
-def get_back_keyboard(callback_data: str, text: Optional[str] = "🔙 Повернутися") -> InlineKeyboardMarkup:
-    return InlineKeyboardMarkup(
-        inline_keyboard=[
-            [
-                InlineKeyboardButton(
-                    text=text,
-                    callback_data=callback_data
-                )
-            ]
-        ]
+BACK_BUTTON_TEXT = "🔙 Повернутися"
+CANCEL_BUTTON_TEXT = "❌ Скасувати"
+# Текст reply-кнопки виходу з налаштувань; за ним же фільтрується обробник
+BACK_TO_MENU_TEXT = "Повернутися в меню"
+
+# Спільні кнопки "Повернутися" для типових переходів
+BACK_BUTTONS = {
+    callback_data: InlineKeyboardButton(text=BACK_BUTTON_TEXT, callback_data=callback_data)
+    for callback_data in (
+        "admin_panel", "back_to_menu", "proxy_catalog", "task_queue", "back_to_server_choice"
     )
+}
+
+
+def get_back_button(callback_data: str) -> InlineKeyboardButton:
+    """Повертає спільну кнопку "Повернутися" для callback_data або створює нову."""
+    button = BACK_BUTTONS.get(callback_data)
+    if button is None:
+        button = InlineKeyboardButton(text=BACK_BUTTON_TEXT, callback_data=callback_data)
+    return button
+
+
+@lru_cache(maxsize=32)
+def get_back_keyboard(callback_data: str, text: Optional[str] = BACK_BUTTON_TEXT) -> InlineKeyboardMarkup:
+    button = get_back_button(callback_data) if text == BACK_BUTTON_TEXT else \
+        InlineKeyboardButton(text=text, callback_data=callback_data)
+    return InlineKeyboardMarkup(inline_keyboard=[[button]])
 
 
+@lru_cache(maxsize=64)
 def get_confirm_or_cancel_keyboard(confirm_callback_data: str, decline_callback_data: str) -> InlineKeyboardMarkup:
     return InlineKeyboardMarkup(inline_keyboard=[
         [
@@ -23,7 +43,7 @@ def get_confirm_or_cancel_keyboard(confirm_callback_data: str, decline_callback_
                 text="✅ Підтвердити",
                 callback_data=confirm_callback_data),
             InlineKeyboardButton(
-                text="❌ Скасувати",
+                text=CANCEL_BUTTON_TEXT,
                 callback_data=decline_callback_data)
         ]
     ])
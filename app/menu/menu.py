@@ -1,20 +1,60 @@
+import asyncio
 from typing import Union
 
 from aiogram.types import Message, CallbackQuery, InlineKeyboardMarkup
 
 from app.database.requests.get_data import get_server_ips_list, get_all_operators, get_all_protocols, \
-    get_available_catalog, get_user_id_by_tg_id, get_user_proxies_list
+    get_available_catalog, get_user_proxies_list_by_tg_id
 from app.database.requests.user import get_user
 from app.keyboards.admin.add_proxies import get_servers_ip_list_keyboard, get_operator_list_keyboard, \
     get_protocols_list_keyboard
-from app.keyboards.admin.panel import get_admin_panel_keyboard
+from app.keyboards.admin.panel import ADMIN_PANEL_KB
 from app.keyboards.admin.proxy_settings import build_pagination_keyboard
 from app.keyboards.catalog import get_catalog_number_keyboard
-from app.keyboards.menu import get_menu_buttons
+from app.keyboards.menu import MAIN_MENU_KB, ADMIN_MAIN_MENU_KB
 from app.utils.admin_utils import is_admin
 from app.utils.text_generator import get_operators_catalog_text, get_profile_text, get_proxy_catalog_text, \
     get_proxies_user_list_text
 
+_ADMIN_PANEL_TEMPLATE = (
+    "🛡️ Адмін Панель\n"
+    "════════════════════════\n\n"
+    "Вітаємо, <b>{name}</b>!\n\n"
+    "📌 ID: <code>{uid}</code>\n"
+    "⚙️ Роль: Адміністратор\n\n"
+    "Обирайте дію з меню нижче ⬇️"
+)
+_SERVER_CHOICE_TEXT = "Оберіть необхідний сервер\n\n"
+_PROTOCOL_CHOICE_TEXT = "Оберіть протокол:"
+
+
+async def _reply(target: Union[Message, CallbackQuery], text: str, keyboard: InlineKeyboardMarkup):
+    """
+    Edits the callback's message (and answers the callback) or replies to a message.
+
+    If the callback's message already shows the same text and keyboard (the
+    user pressed the button of the screen they are on), only the callback is
+    answered: Telegram would reject the edit as "message is not modified".
+
+    Args:
+        target (Union[Message, CallbackQuery]): The target to send or edit the message.
+        text (str): HTML text of the message.
+        keyboard (InlineKeyboardMarkup): Keyboard to attach.
+    """
+    if type(target) is CallbackQuery:
+        message = target.message
+        # Telegram обрізає пробіли й переноси на краях тексту, тож порівнюємо без них
+        if isinstance(message, Message) and message.html_text == text.strip() and message.reply_markup == keyboard:
+            await target.answer()
+            return
+
+        await asyncio.gather(
+            message.edit_text(text, parse_mode="HTML", reply_markup=keyboard),
+            target.answer()
+        )
+    else:
+        await target.answer(text, parse_mode="HTML", reply_markup=keyboard)
+
 
 async def send_server_choice_menu(
         target: Union[Message, CallbackQuery],
@@ -30,16 +70,9 @@ async def send_server_choice_menu(
     """
     server_ips = await get_server_ips_list()
 
-    text = (
-        "Оберіть необхідний сервер\n\n"
-    )
     keyboard = get_servers_ip_list_keyboard(server_ips, back_button_callback_data, back_button_text)
 
-    if isinstance(target, CallbackQuery):
-        await target.message.edit_text(text, parse_mode="HTML", reply_markup=keyboard)
-        await target.answer()
-    elif isinstance(target, Message):
-        await target.answer(text, parse_mode="HTML", reply_markup=keyboard)
+    await _reply(target, _SERVER_CHOICE_TEXT, keyboard)
 
 
 async def send_admin_panel(target, user_id: int, first_name: str):
@@ -51,20 +84,9 @@ async def send_admin_panel(target, user_id: int, first_name: str):
         user_id (int): Telegram user ID of the admin.
         first_name (str): First name of the admin user.
     """
-    text = (
-        "🛡️ Адмін Панель\n"
-        "════════════════════════\n\n"
-        f"Вітаємо, <b>{first_name}</b>!\n\n"
-        f"📌 ID: <code>{user_id}</code>\n"
-        "⚙️ Роль: Адміністратор\n\n"
-        "Обирайте дію з меню нижче ⬇️"
-    )
+    text = _ADMIN_PANEL_TEMPLATE.format(name=first_name, uid=user_id)
 
-    if isinstance(target, CallbackQuery):
-        await target.message.edit_text(text, parse_mode="HTML", reply_markup=get_admin_panel_keyboard())
-        await target.answer()
-    elif isinstance(target, Message):
-        await target.answer(text, parse_mode="HTML", reply_markup=get_admin_panel_keyboard())
+    await _reply(target, text, ADMIN_PANEL_KB)
 
 
 async def send_operators_choice_menu(target: Union[Message, CallbackQuery]):
@@ -76,20 +98,9 @@ async def send_operators_choice_menu(target: Union[Message, CallbackQuery]):
     """
     operators = await get_all_operators()
     text = get_operators_catalog_text(operators)
+    keyboard = get_operator_list_keyboard(len(operators))
 
-    if isinstance(target, CallbackQuery):
-        await target.message.edit_text(
-            text,
-            parse_mode="HTML",
-            reply_markup=get_operator_list_keyboard(len(operators))
-        )
-        await target.answer()
-    elif isinstance(target, Message):
-        await target.answer(
-            text,
-            parse_mode="HTML",
-            reply_markup=get_operator_list_keyboard(len(operators))
-        )
+    await _reply(target, text, keyboard)
 
 
 async def send_protocols_choice_menu(target: Union[Message, CallbackQuery]):
@@ -100,22 +111,9 @@ async def send_protocols_choice_menu(target: Union[Message, CallbackQuery]):
         target (Union[Message, CallbackQuery]): The target to send or edit the message.
     """
     protocols = await get_all_protocols()
-    text = "Оберіть протокол:"
     keyboard = get_protocols_list_keyboard(protocols)
 
-    if isinstance(target, CallbackQuery):
-        await target.message.edit_text(
-            text,
-            parse_mode="HTML",
-            reply_markup=keyboard
-        )
-        await target.answer()
-    elif isinstance(target, Message):
-        await target.answer(
-            text,
-            parse_mode="HTML",
-            reply_markup=keyboard
-        )
+    await _reply(target, _PROTOCOL_CHOICE_TEXT, keyboard)
 
 
 async def send_main_menu(tg_id: int, is_callback: bool = False, message=None, callback: CallbackQuery = None):
@@ -130,21 +128,9 @@ async def send_main_menu(tg_id: int, is_callback: bool = False, message=None, ca
     """
     user = await get_user(tg_id)
     text = get_profile_text(user)
-    keyboard = InlineKeyboardMarkup(inline_keyboard=get_menu_buttons(is_admin(tg_id)))
+    keyboard = ADMIN_MAIN_MENU_KB if is_admin(tg_id) else MAIN_MENU_KB
 
-    if is_callback:
-        await callback.message.edit_text(
-            text=text,
-            parse_mode="HTML",
-            reply_markup=keyboard
-        )
-        await callback.answer()
-    else:
-        await message.answer(
-            text=text,
-            parse_mode="HTML",
-            reply_markup=keyboard
-        )
+    await _reply(callback if is_callback else message, text, keyboard)
 
 
 async def send_catalog_page(target: Union[Message, CallbackQuery]):
@@ -161,19 +147,7 @@ async def send_catalog_page(target: Union[Message, CallbackQuery]):
         text += "\nВиберіть потрібний проксі для оренди."
     keyboard = get_catalog_number_keyboard(available_catalog)
 
-    if isinstance(target, CallbackQuery):
-        await target.message.edit_text(
-            text=text,
-            parse_mode="HTML",
-            reply_markup=keyboard
-        )
-        await target.answer()
-    elif isinstance(target, Message):
-        await target.answer(
-            text=text,
-            parse_mode="HTML",
-            reply_markup=keyboard
-        )
+    await _reply(target, text, keyboard)
 
 
 async def send_my_proxies_page(target: Union[Message, CallbackQuery]):
@@ -183,24 +157,11 @@ async def send_my_proxies_page(target: Union[Message, CallbackQuery]):
     Args:
         target (Union[Message, CallbackQuery]): The target to send or edit the message.
     """
-    user_id = await get_user_id_by_tg_id(target.from_user.id)
-    user_proxies = await get_user_proxies_list(user_id)
+    user_proxies = await get_user_proxies_list_by_tg_id(target.from_user.id)
     text, total_pages = get_proxies_user_list_text(user_proxies)
     keyboard = build_pagination_keyboard(page=1, total_pages=total_pages, back_callback_data="back_to_menu")
 
-    if isinstance(target, CallbackQuery):
-        await target.message.edit_text(
-            text,
-            parse_mode="HTML",
-            reply_markup=keyboard
-        )
-        await target.answer()
-    elif isinstance(target, Message):
-        await target.answer(
-            text,
-            parse_mode="HTML",
-            reply_markup=keyboard
-        )
+    await _reply(target, text, keyboard)
 
 
 
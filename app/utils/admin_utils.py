@@ -1,4 +1,7 @@
 from config import ADMINS
 
+# config.ADMINS may be any iterable; a frozenset gives O(1) membership checks
+ADMIN_IDS = frozenset(ADMINS)
+
 def is_admin(user_id: int) -> bool:
-    return user_id in ADMINS
+    return user_id in ADMIN_IDS
@@ -0,0 +1,32 @@
+import asyncio
+import logging
+from typing import Any, Coroutine
+
+# Strong references to running tasks; the event loop only keeps weak ones
+_background_tasks: set[asyncio.Task] = set()
+
+
+def _on_task_done(task: asyncio.Task) -> None:
+    _background_tasks.discard(task)
+    if not task.cancelled() and task.exception() is not None:
+        logging.warning(f"Background task {task.get_name()} failed: {task.exception()}")
+
+
+def fire_and_forget(coro: Coroutine[Any, Any, Any]) -> asyncio.Task:
+    """
+    Runs a coroutine in the background without blocking the caller.
+
+    Intended for Telegram calls whose result the handler doesn't need, such as
+    callback.answer() or deleting old messages, and for the long-running loops
+    started with the bot. Errors are logged, not raised.
+
+    Args:
+        coro (Coroutine): The coroutine to run.
+
+    Returns:
+        asyncio.Task: The scheduled task.
+    """
+    task = asyncio.create_task(coro)
+    _background_tasks.add(task)
+    task.add_done_callback(_on_task_done)
+    return task
@@ -0,0 +1,120 @@
+import asyncio
+import functools
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Hashable
+
+_MISSING = object()
+
+
+class AsyncTTLCache:
+    """
+    Bounded in-process cache for the results of an async function.
+
+    Entries expire ``ttl`` seconds after they were stored; when more than
+    ``maxsize`` keys are cached the least recently used one is dropped.
+    Concurrent calls with the same arguments share a single underlying call. A result
+    whose load overlapped an ``invalidate()`` or ``clear()`` is returned but not cached.
+
+    Args:
+        func (Callable[..., Awaitable]): The coroutine function to cache.
+        ttl (float): Lifetime of a cached value in seconds.
+        maxsize (int): Maximum number of cached keys.
+    """
+
+    def __init__(self, func: Callable[..., Awaitable], ttl: float, maxsize: int = 128):
+        self._func = func
+        self._ttl = ttl
+        self._maxsize = maxsize
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        # key -> [lock, number of calls using it]
+        self._locks: dict[Hashable, list] = {}
+        # Bumped by invalidate()/clear(); a load that overlapped a bump may hold stale data
+        self._generation = 0
+        functools.update_wrapper(self, func)
+
+    @staticmethod
+    def _make_key(args: tuple, kwargs: dict) -> Hashable:
+        if kwargs:
+            return args + tuple(sorted(kwargs.items()))
+        return args
+
+    def _get(self, key: Hashable) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            return _MISSING
+
+        expires_at, value = entry
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return _MISSING
+
+        self._data.move_to_end(key)
+        return value
+
+    def _store(self, key: Hashable, value: Any) -> None:
+        self._data[key] = (time.monotonic() + self._ttl, value)
+        self._data.move_to_end(key)
+        while len(self._data) > self._maxsize:
+            self._data.popitem(last=False)
+
+    async def __call__(self, *args, **kwargs) -> Any:
+        key = self._make_key(args, kwargs)
+        value = self._get(key)
+        if value is not _MISSING:
+            return value
+
+        entry = self._locks.get(key)
+        if entry is None:
+            entry = self._locks[key] = [asyncio.Lock(), 0]
+        entry[1] += 1
+        try:
+            async with entry[0]:
+                value = self._get(key)
+                if value is _MISSING:
+                    generation = self._generation
+                    value = await self._func(*args, **kwargs)
+                    # Don't cache a result loaded before a concurrent invalidate()/clear()
+                    if generation == self._generation:
+                        self._store(key, value)
+                return value
+        finally:
+            entry[1] -= 1
+            if not entry[1]:
+                self._locks.pop(key, None)
+
+    def peek(self, *args, **kwargs) -> Any:
+        """Returns the cached result for the given arguments without calling the function, or None."""
+        value = self._get(self._make_key(args, kwargs))
+        return None if value is _MISSING else value
+
+    def set(self, *args, value: Any, **kwargs) -> None:
+        """Stores ``value`` as the cached result for the given arguments."""
+        self._store(self._make_key(args, kwargs), value)
+
+    def invalidate(self, *args, **kwargs) -> None:
+        """Drops the cached result for the given arguments, if any."""
+        self._generation += 1
+        self._data.pop(self._make_key(args, kwargs), None)
+
+    def clear(self) -> None:
+        """Drops all cached results."""
+        self._generation += 1
+        self._data.clear()
+
+
+def async_ttl_cache(ttl: float, maxsize: int = 128) -> Callable[[Callable[..., Awaitable]], AsyncTTLCache]:
+    """
+    Decorator that wraps a coroutine function in an :class:`AsyncTTLCache`.
+
+    Args:
+        ttl (float): Lifetime of a cached value in seconds.
+        maxsize (int, optional): Maximum number of cached keys. Defaults to 128.
+
+    Returns:
+        Callable: Decorator producing the cached function.
+    """
+    def decorator(func: Callable[..., Awaitable]) -> AsyncTTLCache:
+        return AsyncTTLCache(func, ttl=ttl, maxsize=maxsize)
+
+    return decorator
@@ -0,0 +1,32 @@
+import logging
+from typing import Optional
+
+from aiogram import Bot
+from aiogram.exceptions import TelegramBadRequest, TelegramNotFound
+from aiogram.fsm.context import FSMContext
+
+CLEANUP_IDS_KEY = "cleanup_ids"
+
+
+async def track_for_cleanup(state: FSMContext, *message_ids: int) -> None:
+    """Запам'ятовує id повідомлень, які треба буде видалити пізніше."""
+    data = await state.get_data()
+    await state.update_data({CLEANUP_IDS_KEY: [*data.get(CLEANUP_IDS_KEY, []), *message_ids]})
+
+
+async def delete_tracked_messages(bot: Bot, chat_id: int, state: FSMContext, data: Optional[dict] = None) -> None:
+    """
+    Видаляє всі відстежені повідомлення одним запитом delete_messages.
+
+    ``data`` можна передати, якщо дані стану вже прочитані (наприклад, перед state.clear()).
+    """
+    if data is None:
+        data = await state.get_data()
+    message_ids = data.get(CLEANUP_IDS_KEY)
+    if not message_ids:
+        return
+
+    try:
+        await bot.delete_messages(chat_id=chat_id, message_ids=message_ids)
+    except (TelegramBadRequest, TelegramNotFound) as e:
+        logging.debug(f"Could not delete messages {message_ids}: {e}")
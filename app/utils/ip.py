@@ -0,0 +1,20 @@
+from ipaddress import IPv4Address, AddressValueError
+
+
+def validate_ipv4(ip: str) -> bool:
+    """
+    Checks that a string is a valid dotted-quad IPv4 address.
+
+    Octets must be in the 0-255 range and must not have leading zeros.
+
+    Args:
+        ip (str): The string to check.
+
+    Returns:
+        bool: True if the string is a valid IPv4 address, False otherwise.
+    """
+    try:
+        IPv4Address(ip)
+    except AddressValueError:
+        return False
+    return True
@@ -1,21 +1,23 @@
 import random
 import string
 
+# Credentials are real proxy logins, so draw them from the OS CSPRNG
+_rng = random.SystemRandom()
 
-async def generate_3proxy_credentials() -> dict:
-    safe_chars = (
-            string.ascii_letters +  # A-Z, a-z
-            string.digits +  # 0-9
-            "_-!@#$%^&*()+={}|',.?/~"
-    )
+LOGIN_FIRST_CHARS = string.ascii_letters
+LOGIN_CHARS = string.ascii_letters + string.digits + '_-.'
+PASSWORD_CHARS = (
+        string.ascii_letters +  # A-Z, a-z
+        string.digits +  # 0-9
+        "_-!@#$%^&*()+={}|',.?/~"
+)
 
-    login = random.choice(string.ascii_letters)
-    login += ''.join(random.choice(string.ascii_letters + string.digits + '_-.')
-                     for _ in range(13))
 
-    password = ''.join(random.choice(safe_chars) for _ in range(13))
+async def generate_3proxy_credentials() -> dict:
+    login = _rng.choice(LOGIN_FIRST_CHARS) + ''.join(_rng.choices(LOGIN_CHARS, k=13))
+    password = ''.join(_rng.choices(PASSWORD_CHARS, k=13))
 
     return {
         'login': login,
         'password': password
-    }
\ No newline at end of file
+    }
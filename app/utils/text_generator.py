@@ -1,32 +1,83 @@
 import json
 from datetime import datetime
+from functools import lru_cache
+from operator import itemgetter
 from typing import List, Dict, Tuple
 
 from app.database.models import ProxyTaskQueue
 
 
 def get_profile_text(user_data) -> str:
+    return _render_profile(
+        user_data.tg_id, user_data.first_name, user_data.last_name, user_data.phone_number, user_data.balance
+    )
+
+
+# Ключ містить усі поля профілю, тож зміна будь-якого з них (зокрема балансу) дає новий текст
+@lru_cache(maxsize=1024)
+def _render_profile(tg_id, first_name, last_name, phone_number, balance) -> str:
     return (
-        f"👤 <b>{user_data.first_name} {user_data.last_name or ''}</b>\n"
+        f"👤 <b>{first_name} {last_name or ''}</b>\n"
         "════════════════════════\n\n"
-        f"📌 <b>ID:</b> <code>{user_data.tg_id}</code>\n"
-        f"📱 <b>Телефон:</b> {user_data.phone_number}\n"
-        f"💳 <b>Баланс:</b> {user_data.balance} монет\n\n"
+        f"📌 <b>ID:</b> <code>{tg_id}</code>\n"
+        f"📱 <b>Телефон:</b> {phone_number}\n"
+        f"💳 <b>Баланс:</b> {balance} монет\n\n"
         "<b>Доступні дії:</b>"
     )
 
+_STATUS_ICONS: Dict[str, str] = {
+    "available": "🟢",
+    "rented": "🟡",
+    "unavailable": "🔴",
+}
+_DEFAULT_STATUS_ICON = "⚪"
+
+# Початок посилання для підключення за протоколом проксі (невідомі протоколи - http)
+_CONNECT_PREFIXES: Dict[str, str] = {
+    "SOCKS5": "socks5://",
+    "SOCKS4": "socks4://",
+    "HTTP": "http://",
+    "HTTPS": "http://",
+}
+
+
+_USER_PROXY_FIELDS = itemgetter(
+    'login', 'password', 'ip', 'port', 'protocol', 'country_code', 'operator', 'purchase_date', 'expire_date'
+)
+
+
+def _clamp_page(page: int, total_count: int, per_page: int) -> Tuple[int, int]:
+    # Повертає (номер сторінки в межах 1..total_pages, total_pages)
+    total_pages = (total_count + per_page - 1) // per_page
+    return max(1, min(page, total_pages)), total_pages
+
+
+def _format_datetime(d: datetime) -> str:
+    # Те саме, що strftime("%d.%m.%Y %H:%M"), без розбору формату на кожному виклику
+    return f"{d.day:02d}.{d.month:02d}.{d.year:04d} {d.hour:02d}:{d.minute:02d}"
+
+
+def _format_datetime_seconds(d: datetime) -> str:
+    return f"{_format_datetime(d)}:{d.second:02d}"
+
+
+# Латинські літери -> регіональні індикатори (A -> 🇦), пара індикаторів дає прапор
+_FLAG_TABLE = str.maketrans({chr(c): chr(c + 127397) for c in range(ord('A'), ord('Z') + 1)})
+
+
+@lru_cache(maxsize=512)
 def country_code_to_flag(code: str) -> str:
-    return ''.join(chr(127397 + ord(char)) for char in code.upper())
+    return code.upper().translate(_FLAG_TABLE)
 
 def get_proxy_catalog_text(catalog_list) -> str:
     if not catalog_list:
         return "Каталог проксі наразі порожній."
 
-    text = "📡 Каталог проксі\n\n"
+    parts: List[str] = ["📡 Каталог проксі\n\n"]
 
     for item in catalog_list:
         flag = country_code_to_flag(item["country_code"])
-        text += (
+        parts.append(
             f"<b>ID: {item['catalog_id']}\n</b>"
             f"<pre> 🛡️ Протокол: <b>{item['protocol']}</b>\n"
             f" {flag} Оператор: <b>{item['operator']} {item['country_code']}</b>\n"
@@ -34,63 +85,61 @@ def get_proxy_catalog_text(catalog_list) -> str:
             f" 📦 В наявності: <b>{item['available_amount']}</b>\n"
             f" 💲 Ціна: <b>{item['price_per_week']}</b>/тиждень</pre>\n\n"
         )
-    return text
+    return "".join(parts)
 
 def get_operators_catalog_text(operators_list) -> str:
     if not operators_list:
         return "Операторів немає в базі."
 
-    text = "📡 Каталог операторів\n\n"
+    parts: List[str] = ["📡 Каталог операторів\n\n"]
 
     for idx, operator in enumerate(operators_list, 1):
         flag = country_code_to_flag(operator["country_code"])
-        text += (
+        parts.append(
             f"{idx}. {flag} Оператор: <b>{operator['name']} ({operator['country_code']})</b>\n"
         )
 
-    text += "\nВиберіть оператора для подальших дій."
+    parts.append("\nВиберіть оператора для подальших дій.")
 
-    return text
+    return "".join(parts)
 
 
-def get_proxies_admin_list_text(proxies: List[Dict], page: int = 1, per_page: int = 6) -> Tuple[str, int]:
-    if not proxies:
-        return "📡 Список проксі наразі порожній.", 0
+# Рядок залежить лише від полів проксі, тож при гортанні сторінок він береться з кешу
+@lru_cache(maxsize=4096)
+def _render_proxy_row(proxy_id, server_ip, internal_ip, operator, country, protocol, status) -> str:
+    status_icon = _STATUS_ICONS.get(status.lower(), _DEFAULT_STATUS_ICON)
 
-    STATUS_ICONS = {
-        "available": "🟢",
-        "rented": "🟡",
-        "unavailable": "🔴",
-    }
+    return (
+        f"<pre>id: {proxy_id}\n"
+        f"server ip: {server_ip}\n"
+        f"internal IP: {internal_ip}\n"
+        f"operator: {operator} ({country})\n"
+        f"protocol: {protocol}\n"
+        f"status: {status} {status_icon}</pre>\n\n"
+    )
 
-    total_pages = (len(proxies) + per_page - 1) // per_page
-    page = max(1, min(page, total_pages))
-    start_idx = (page - 1) * per_page
-    end_idx = start_idx + per_page
-    page_proxies = proxies[start_idx:end_idx]
 
-    header = (
+def get_proxies_admin_list_text(page_proxies: List[Dict], total_count: int, page: int = 1, per_page: int = 6) -> Tuple[str, int]:
+    if not page_proxies:
+        return "📡 Список проксі наразі порожній.", 0
+
+    page, total_pages = _clamp_page(page, total_count, per_page)
+
+    parts: List[str] = [
         "🌐 <b>Список проксі</b>\n"
         f"Сторінка <b>{page}</b> з <b>{total_pages}</b>\n\n"
-    )
+    ]
 
-    body = ""
     for proxy in page_proxies:
-        status_icon = STATUS_ICONS.get(proxy["status"].lower(), "⚪")
-
-        body += (
-            f"<pre>id: {proxy['id']}\n"
-            f"server ip: {proxy['server_ip']}\n"
-            f"internal IP: {(proxy['internal_ip'])}\n"
-            f"operator: {proxy['operator']} ({proxy['country']})\n"
-            f"protocol: {proxy['protocol']}\n"
-            f"status: {proxy['status']} {status_icon}</pre>\n\n"
-        )
+        parts.append(_render_proxy_row(
+            proxy["id"], proxy["server_ip"], proxy["internal_ip"],
+            proxy["operator"], proxy["country"], proxy["protocol"], proxy["status"]
+        ))
 
-    if len(proxies) >= per_page:
-        body += "ℹ️ Використовуйте кнопки навігації для перегляду"
+    if total_count >= per_page:
+        parts.append("ℹ️ Використовуйте кнопки навігації для перегляду")
 
-    return header + body, total_pages
+    return "".join(parts), total_pages
 
 
 def get_catalog_item_text(catalog_item) -> str:
@@ -116,41 +165,41 @@ def get_proxies_user_list_text(proxies: List[Dict], page: int = 1, per_page: int
     if not proxies:
         return "📡 Список проксі наразі порожній.", 0
 
-    total_pages = (len(proxies) + per_page - 1) // per_page
-    page = max(1, min(page, total_pages))
+    page, total_pages = _clamp_page(page, len(proxies), per_page)
     start_idx = (page - 1) * per_page
     end_idx = start_idx + per_page
     page_proxies = proxies[start_idx:end_idx]
+    now = datetime.now()
 
-    text = "🌐 <b>Ваші проксі сервери</b>\n\n"
+    parts: List[str] = ["🌐 <b>Ваші проксі сервери</b>\n\n"]
 
     for idx, proxy in enumerate(page_proxies, start_idx + 1):
+        (login, password, ip, port, protocol, country_code, operator,
+         purchase_dt, expire_dt) = _USER_PROXY_FIELDS(proxy)
+
         # Форматування дат
-        purchase_date = proxy['purchase_date'].strftime("%d.%m.%Y %H:%M")
-        expire_date = proxy['expire_date'].strftime("%d.%m.%Y %H:%M")
+        purchase_date = _format_datetime(purchase_dt)
+        expire_date = _format_datetime(expire_dt)
 
         # Розрахунок часу, що залишився
-        time_left = proxy['expire_date'] - datetime.now()
+        time_left = expire_dt - now
         days = time_left.days
         hours, remainder = divmod(time_left.seconds, 3600)
         minutes = remainder // 60
         time_left_str = f"{days} дн. {hours} год. {minutes} хв."
 
         # Формування посилання
-        protocol = proxy['protocol'].upper()
-        if protocol in ('SOCKS5'):
-            connect_link = f"socks5://{proxy['login']}:{proxy['password']}@{proxy['ip']}:{proxy['port']}"
-        else:
-            connect_link = f"http://{proxy['login']}:{proxy['password']}@{proxy['ip']}:{proxy['port']}"
-        flag = country_code_to_flag(proxy['country_code'])
-        text += (
+        connect_prefix = _CONNECT_PREFIXES.get(protocol.upper(), "http://")
+        connect_link = f"{connect_prefix}{login}:{password}@{ip}:{port}"
+        flag = country_code_to_flag(country_code)
+        parts.append(
             f"🔹 <b>Проксі #{idx}</b>\n"
-            f"<code>{proxy['ip']}:{proxy['port']}</code>\n"
-            f"<b>Логін:</b> <code>{proxy['login']}</code>\n"
-            f"<b>Пароль:</b> <code>{proxy['password']}</code>\n\n"
-            f" 🛡️ <b>Тип:</b> {proxy['protocol']}\n"
-            f" 🌎 <b>Країна:</b> {flag}{proxy['country_code']}\n"
-            f" 📶 <b>Оператор:</b> {proxy['operator']}\n"
+            f"<code>{ip}:{port}</code>\n"
+            f"<b>Логін:</b> <code>{login}</code>\n"
+            f"<b>Пароль:</b> <code>{password}</code>\n\n"
+            f" 🛡️ <b>Тип:</b> {protocol}\n"
+            f" 🌎 <b>Країна:</b> {flag}{country_code}\n"
+            f" 📶 <b>Оператор:</b> {operator}\n"
             f" 📅 <b>Орендовано:</b> {purchase_date}\n"
             f" ⏳ <b>Закінчується:</b> {expire_date}\n"
             f" ⏱️ <b>Залишилось:</b> {time_left_str}\n\n"
@@ -160,51 +209,71 @@ def get_proxies_user_list_text(proxies: List[Dict], page: int = 1, per_page: int
         )
 
     if len(proxies) > per_page:
-        text += f"📖 Сторінка {page} з {total_pages} - використовуйте кнопки навігації"
+        parts.append(f"📖 Сторінка {page} з {total_pages} - використовуйте кнопки навігації")
 
-    return text, total_pages
+    return "".join(parts), total_pages
 
-def get_pending_task_list_text(tasks: List[ProxyTaskQueue], page: int = 1, per_page: int = 3) -> Tuple[str, int]:
-    if not tasks:
-        return "⏳ Немає завдань", 0
+class _NotInCacheKey:
+    # Передає значення через lru_cache, не додаючи його до ключа кешу
+    __slots__ = ("value",)
 
-    total_pages = (len(tasks) + per_page - 1) // per_page
-    page = max(1, min(page, total_pages))
-    start_idx = (page - 1) * per_page
-    end_idx = start_idx + per_page
-    page_tasks = tasks[start_idx:end_idx]
+    def __init__(self, value):
+        self.value = value
 
-    text = f"📋 <b>Список завдань: {len(tasks)}</b>\n\n"
+    def __eq__(self, other):
+        return isinstance(other, _NotInCacheKey)
 
-    for task in page_tasks:
+    def __hash__(self):
+        return 0
+
+
+def _format_payload(task_id: int, payload) -> str:
+    return _format_payload_cached(task_id, _NotInCacheKey(payload))
 
-        payload_info = ""
-        if isinstance(task.payload, dict):
 
-            for key, value in task.payload.items():
-                if isinstance(value, (dict, list)):
-                    value_str = json.dumps(value, ensure_ascii=False, indent=2)
-                    payload_info += f"  {key}: \n{value_str}\n"
-                else:
-                    payload_info += f"  {key}: {value}\n"
+# Payload завдання записується лише при створенні, тож його текст кешується за id завдання
+@lru_cache(maxsize=1024)
+def _format_payload_cached(task_id: int, payload_ref: _NotInCacheKey) -> str:
+    payload = payload_ref.value
+    if not isinstance(payload, dict):
+        return f"  {str(payload)}\n"
+
+    lines = []
+    for key, value in payload.items():
+        if isinstance(value, (dict, list)):
+            value_str = json.dumps(value, ensure_ascii=False, indent=2)
+            lines.append(f"  {key}: \n{value_str}\n")
         else:
-            payload_info += f"  {str(task.payload)}\n"
+            lines.append(f"  {key}: {value}\n")
+    return "".join(lines)
+
+
+def get_pending_task_list_text(page_tasks: List[ProxyTaskQueue], total_count: int, page: int = 1, per_page: int = 3) -> Tuple[str, int]:
+    if not page_tasks:
+        return "⏳ Немає завдань", 0
+
+    page, total_pages = _clamp_page(page, total_count, per_page)
+
+    parts: List[str] = [f"📋 <b>Список завдань: {total_count}</b>\n\n"]
+
+    for task in page_tasks:
+        payload_info = _format_payload(task.id, task.payload)
 
-        text += (
+        parts.append(
             f"🆔 <b>ID:</b> {task.id}\n"
-            f"📅 <b>Створено:</b> {task.created_at.strftime("%d.%m.%Y %H:%M:%S")}\n"
+            f"📅 <b>Створено:</b> {_format_datetime_seconds(task.created_at)}\n"
         )
         if task.updated_at:
-            text += f"🔄 <b>Оновлено:</b> {task.updated_at.strftime("%d.%m.%Y %H:%M:%S")}\n"
-            text += f"⏱️ <b>Час виконання:</b> {int((task.updated_at - task.created_at).total_seconds() * 1000)} мс\n"
-        text +=(
+            parts.append(f"🔄 <b>Оновлено:</b> {_format_datetime_seconds(task.updated_at)}\n")
+            parts.append(f"⏱️ <b>Час виконання:</b> {int((task.updated_at - task.created_at).total_seconds() * 1000)} мс\n")
+        parts.append(
             f"🔧 <b>Дія:</b> {task.task_type}\n"
             f"<pre>{payload_info}</pre>\n"
         )
         if task.error_message:
-            text += f"<pre>{task.error_message}</pre>\n"
+            parts.append(f"<pre>{task.error_message}</pre>\n")
 
-    if len(tasks) > per_page:
-        text += f"\n📖 Сторінка {page} з {total_pages} - використовуйте кнопки навігації"
+    if total_count > per_page:
+        parts.append(f"\n📖 Сторінка {page} з {total_pages} - використовуйте кнопки навігації")
 
-    return text, total_pages
\ No newline at end of file
+    return "".join(parts), total_pages
\ No newline at end of file
@@ -2,14 +2,23 @@ import asyncio
 import logging
 
 from aiogram import Bot, Dispatcher
+from aiogram.fsm.storage.base import BaseStorage
 from aiogram.fsm.storage.memory import MemoryStorage
 
 from app.database.requests.default_insert import insert_default_protocols, insert_default_statuses
 from app.database.requests.tasks import clean_expired_proxy_rentals
-from app.database.requests.triggers import create_proxy_task_queue_trigger, create_proxy_task_queue_update_trigger
+from app.database.requests.task_events import listen_task_status_events
+from app.database.requests.triggers import create_proxy_task_queue_trigger, create_proxy_task_queue_update_trigger, \
+    create_proxy_task_status_notify_trigger
 from config import TOKEN
 
+try:
+    from config import REDIS_URL
+except ImportError:
+    REDIS_URL = None
+
 from app.database.db import async_main
+from app.utils.background import fire_and_forget
 
 from app.handlers.menu import router as menu_router
 from app.handlers.registration import router as registration_router
@@ -25,33 +34,51 @@ from app.handlers.admin.add_proxies.add_ports_flow import router as add_ports_ro
 from app.handlers.my_proxies import router as my_proxies_router
 from app.handlers.admin.task_queue import router as task_queue_router
 
+# Порядок важливий: роутери перевіряються в цьому порядку
+_ROUTERS = (
+    menu_router,
+    registration_router,
+    admin_router,
+    profile_settings_router,
+    catalog_router,
+    add_proxy_router,
+    add_operator_router,
+    edit_prices_router,
+    proxy_settings_router,
+    add_server_router,
+    add_ports_router,
+    my_proxies_router,
+    task_queue_router,
+)
+
+
+def create_fsm_storage() -> BaseStorage:
+    """Returns Redis FSM storage when REDIS_URL is configured, in-memory storage otherwise."""
+    if not REDIS_URL:
+        return MemoryStorage()
+
+    from aiogram.fsm.storage.redis import RedisStorage, DefaultKeyBuilder
+    return RedisStorage.from_url(REDIS_URL, key_builder=DefaultKeyBuilder(with_bot_id=True))
+
+
 bot = Bot(token=TOKEN)
-dp = Dispatcher(storage=MemoryStorage())
+dp = Dispatcher(storage=create_fsm_storage())
 
 async def main():
     await async_main()
-    await insert_default_protocols()
-    await insert_default_statuses()
-    await create_proxy_task_queue_trigger()
-    asyncio.create_task(clean_expired_proxy_rentals())
-    await create_proxy_task_queue_update_trigger()
-    print("Бот запущено...")
-
-    dp.include_routers(
-        menu_router,
-        registration_router,
-        admin_router,
-        profile_settings_router,
-        catalog_router,
-        add_proxy_router,
-        add_operator_router,
-        edit_prices_router,
-        proxy_settings_router,
-        add_server_router,
-        add_ports_router,
-        my_proxies_router,
-        task_queue_router
+    # Після створення таблиць початкові дані й тригери не залежать одне від одного
+    await asyncio.gather(
+        insert_default_protocols(),
+        insert_default_statuses(),
+        create_proxy_task_queue_trigger(),
+        create_proxy_task_queue_update_trigger(),
+        create_proxy_task_status_notify_trigger()
     )
+    fire_and_forget(clean_expired_proxy_rentals())
+    fire_and_forget(listen_task_status_events())
+    logging.info("Bot started")
+
+    dp.include_routers(*_ROUTERS)
 
     await dp.start_polling(bot)
 
@@ -60,4 +87,4 @@ if __name__ == "__main__":
     try:
         asyncio.run(main())
     except KeyboardInterrupt:
-        print("Bot Stopped")
\ No newline at end of file
+        logging.info("Bot stopped")
\ No newline at end of file